@@ -0,0 +1,128 @@
+"""
+Microbenchmark of the latency of reports from enhancer processes to the
+coordinating process, for ``multiprocessing.Manager().Queue()`` versus
+``lib.reports.ReportPipes``, and for edge deltas versus whole graphs,
+as well as of applying edge deltas in the coordinating process (see
+``lib.distributed.Coordinator``).
+
+Run from the repository's root: ``python3 -O -m
+benchmarks.report_latency [<order> <degree>]`` (w/o ``-O``,
+``Coordinator.submit_trusted()`` verifies the analysis).
+"""
+
+from sys import argv
+from time import perf_counter
+from statistics import median
+from multiprocessing import Process, Manager, Event
+
+from lib.graph_elements import GolfGraph
+from lib.enhancers import RandomlyReplaceEightEdges
+from lib.reports import ReportPipes
+from lib.distributed import Coordinator
+
+MESSAGES = 200
+"""
+Number of messages sent per measurement.
+"""
+
+
+def send(report_queue, payload, received):
+    """
+    Puts ``MESSAGES`` tuples of the current time and ``payload``, one
+    after the other ``received`` (to be run in a process).
+    """
+    for _ in range(MESSAGES):
+        report_queue.put((perf_counter(), payload))
+        received.wait()
+        received.clear()
+
+
+def measure(report_queue, get, payload):
+    """
+    Returns the median latency in seconds of messages with ``payload``
+    sent to ``report_queue`` and received (and unpickled) via ``get``.
+    """
+    received = Event()
+    process = Process(target=send, args=(report_queue, payload, received))
+    process.start()
+    latencies = []
+    for _ in range(MESSAGES):
+        sent, _ = get()
+        latencies.append(perf_counter() - sent)
+        received.set()
+    process.join()
+    return median(latencies)
+
+
+def measure_submit(graph, submit, *args):
+    """
+    Returns the median duration in seconds of ``submit`` (a method of
+    ``Coordinator``, called with ``args``) accepting a delta to
+    ``graph``.
+    """
+    durations = []
+    for _ in range(5):
+        coordinator = Coordinator(graph)
+        started = perf_counter()
+        version = submit(coordinator, *args)
+        durations.append(perf_counter() - started)
+        if version != 1:
+            raise RuntimeError("delta not accepted")
+    return median(durations)
+
+
+def main():
+    """
+    Prints the median latencies per channel and payload.
+    """
+    order, degree = map(int, argv[1:3]) if len(argv) > 2 else (1000, 3)
+
+    graph = GolfGraph(order, degree)
+    graph.add_as_many_random_edges_as_possible()
+    graph.analyze()
+    enhanced_graph = None
+    enhancer = RandomlyReplaceEightEdges(None)
+    while enhanced_graph is None:
+        enhanced_graph = enhancer.attempt(graph)
+    removed, added = graph.edge_delta(enhanced_graph)
+    payloads = (
+        ("edge delta", ("RandomlyReplaceEightEdges", 0, removed, added,
+                        enhanced_graph.analysis())),
+        ("graph", ("RandomlyReplaceEightEdges", enhanced_graph)),
+    )
+
+    print("order=%i degree=%i, median latencies of %i messages:" % (
+        order, degree, MESSAGES
+    ))
+
+    manager = Manager()
+    for payload_name, payload in payloads:
+        report_queue = manager.Queue()
+        print("  Manager().Queue(), %s: %.3f ms" % (
+            payload_name, measure(report_queue, report_queue.get,
+                                  payload) * 1000
+        ))
+
+        reports = ReportPipes()
+        report_writer = reports.writer()
+        print("  ReportPipes, %s: %.3f ms" % (
+            payload_name, measure(report_writer, reports.get, payload) * 1000
+        ))
+        reports.close()
+    manager.shutdown()
+
+    print("order=%i degree=%i, median durations of applying a delta:" % (
+        order, degree
+    ))
+    print("  Coordinator.submit(): %.3f ms" % (
+        measure_submit(graph, Coordinator.submit, 0, removed, added,
+                       enhanced_graph.metrics()) * 1000
+    ))
+    print("  Coordinator.submit_trusted(): %.3f ms" % (
+        measure_submit(graph, Coordinator.submit_trusted, 0, removed,
+                       added, enhanced_graph.analysis()) * 1000
+    ))
+
+
+if __name__ == "__main__":
+    main()
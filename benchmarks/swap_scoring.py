@@ -0,0 +1,99 @@
+"""
+Benchmark of scoring batches of swaps with ``lib.scoring.score_swaps()``
+versus scoring the swapped graphs one after the other with
+``lib.scoring.score()`` (with the same bound, i.e., the best score so
+far).
+
+Run from the repository's root: ``python3 -m benchmarks.swap_scoring
+[<order> <degree>]``.
+"""
+
+from sys import argv
+from time import perf_counter
+from random import choice
+
+from lib.graph_elements import GolfGraph
+from lib.scoring import neighbours, score, score_swaps, swap, unswap
+
+BATCH_SIZES = (1, 4, 16, 64)
+"""
+Numbers of swaps per batch.
+"""
+
+REPETITIONS = 5
+"""
+Number of measurements per batch (of which we take the fastest).
+"""
+
+
+def random_swaps(graph_neighbours, count):
+    """
+    Returns a list of ``count`` random swaps (see ``score_swaps()``).
+    """
+    order = len(graph_neighbours)
+    swaps = []
+    while len(swaps) < count:
+        a_id = choice(range(order))
+        c_id = choice(range(order))
+        b_id = choice(graph_neighbours[a_id])
+        d_id = choice(graph_neighbours[c_id])
+        if (len({a_id, b_id, c_id, d_id}) == 4 and
+                c_id not in graph_neighbours[a_id] and
+                d_id not in graph_neighbours[b_id]):
+            swaps.append((a_id, b_id, c_id, d_id))
+    return swaps
+
+
+def score_one_by_one(graph_neighbours, swaps):
+    """
+    Returns the same scores as ``score_swaps()``, via ``score()``.
+    """
+    scores = []
+    bound = None
+    for candidate_swap in swaps:
+        swap(graph_neighbours, candidate_swap)
+        swap_score = score(graph_neighbours, bound)
+        unswap(graph_neighbours, candidate_swap)
+        scores.append(swap_score)
+        if swap_score is not None and (bound is None or swap_score < bound):
+            bound = swap_score
+    return scores
+
+
+def measure(function, graph_neighbours, swaps):
+    """
+    Returns the scores and the fastest time in seconds of ``function``.
+    """
+    times = []
+    for _ in range(REPETITIONS):
+        start = perf_counter()
+        scores = function(graph_neighbours, swaps)
+        times.append(perf_counter() - start)
+    return scores, min(times)
+
+
+def main():
+    """
+    Prints the times per batch size.
+    """
+    order, degree = map(int, argv[1:3]) if len(argv) > 2 else (1000, 3)
+
+    graph = GolfGraph(order, degree)
+    graph.add_as_many_random_edges_as_possible()
+    graph_neighbours = neighbours(graph)
+    print("order=%i degree=%i, fastest of %i:" % (order, degree,
+                                                  REPETITIONS))
+
+    for batch_size in BATCH_SIZES:
+        swaps = random_swaps(graph_neighbours, batch_size)
+        scores, batch_time = measure(score_swaps, graph_neighbours, swaps)
+        expected_scores, sequential_time = measure(score_one_by_one,
+                                                   graph_neighbours, swaps)
+        assert scores == expected_scores
+        print("  %i swaps: score_swaps() %.1f ms, score() %.1f ms" % (
+            batch_size, batch_time * 1000, sequential_time * 1000
+        ))
+
+
+if __name__ == "__main__":
+    main()
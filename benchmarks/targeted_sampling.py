@@ -0,0 +1,67 @@
+"""
+Benchmark of replacing the edges of uniformly sampled vertices versus
+vertices sampled with a preference for remote ones (see
+``AbstractRandomlyReplaceEdgesOfRemoteVertices``).
+
+Run from the repository's root: ``python3 -m benchmarks.targeted_sampling
+[<order> <degree> [<seconds>]]``.
+"""
+
+from sys import argv
+from time import time
+
+from lib.graph_elements import GolfGraph
+from lib.enhancers import (RandomlyReplaceFourEdges,
+                           RandomlyReplaceFourEdgesOfRemoteVertices)
+
+RUNS = 3
+"""
+Number of runs per enhancer (all from the same initial graph).
+"""
+
+
+def run(enhancer_cls, graph, seconds):
+    """
+    Enhances ``graph`` with ``enhancer_cls`` for ``seconds`` and returns
+    the best graph, the number of attempts and the number of
+    improvements.
+    """
+    enhancer = enhancer_cls(None)
+    improvements = 0
+    deadline = time() + seconds
+    while time() < deadline:
+        enhanced_graph = enhancer.attempt(graph)
+        if enhanced_graph is not None:
+            graph = enhanced_graph
+            improvements += 1
+    return graph, enhancer.statistics["attempts"], improvements
+
+
+def main():
+    """
+    Prints the results per enhancer and run.
+    """
+    order, degree = map(int, argv[1:3]) if len(argv) > 2 else (256, 3)
+    seconds = float(argv[3]) if len(argv) > 3 else 30.0
+
+    graph = GolfGraph(order, degree)
+    graph.add_as_many_random_edges_as_possible()
+    graph.analyze()
+    print("order=%i degree=%i, %i runs of %.0f s from diameter=%i "
+          "total distance=%i:" % (order, degree, RUNS, seconds,
+                                  graph.diameter, graph.total_distance))
+
+    for enhancer_cls in (RandomlyReplaceFourEdges,
+                         RandomlyReplaceFourEdgesOfRemoteVertices):
+        for _ in range(RUNS):
+            best_graph, attempts, improvements = run(enhancer_cls, graph,
+                                                     seconds)
+            print("  %s: %i attempts, %i improvements, diameter=%i "
+                  "total distance=%i" % (
+                      enhancer_cls.__name__, attempts, improvements,
+                      best_graph.diameter, best_graph.total_distance
+                  ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark of the memory per vertex and the throughput of breadth-first
+searches (the innermost loops of the analysis), to compare object
+models of ``Vertex``.
+
+Run from the repository's root: ``python3 -m benchmarks.vertex_model
+[<order> <degree>]`` (with CPython and PyPy3).
+"""
+
+from sys import argv
+from time import perf_counter
+from tracemalloc import start, stop, get_traced_memory
+
+from lib.graph_elements import GolfGraph
+from lib import kernels
+
+REPETITIONS = 3
+"""
+Number of measurements (of which we take the fastest).
+"""
+
+
+def memory_per_vertex(order, degree):
+    """
+    Returns the bytes allocated per vertex of a random graph of
+    ``order`` and ``degree`` (w/o analysis).
+    """
+    start()
+    graph = GolfGraph(order, degree)
+    graph.add_as_many_random_edges_as_possible()
+    allocated = get_traced_memory()[0]
+    stop()
+    del graph
+    return allocated / order
+
+
+def searches_per_second(graph):
+    """
+    Returns the number of breadth-first searches per second, as made by
+    ``GolfGraph.analyze()``.
+    """
+    times = []
+    for _ in range(REPETITIONS):
+        graph.hops_cache.clear()
+        start_time = perf_counter()
+        for vertex in graph.vertices:
+            graph._breadth_first_search(vertex)
+        times.append(perf_counter() - start_time)
+    return graph.order / min(times)
+
+
+def main():
+    """
+    Prints the memory per vertex and the throughput of searches.
+    """
+    order, degree = map(int, argv[1:3]) if len(argv) > 2 else (2000, 3)
+
+    graph = GolfGraph(order, degree)
+    graph.add_as_many_random_edges_as_possible()
+    graph.analyze()
+
+    print("order=%i degree=%i (%s kernels):" % (order, degree,
+                                                kernels.NAME))
+    print("  memory per vertex (incl. edges): %.0f bytes" % (
+        memory_per_vertex(order, degree)
+    ))
+    searches = searches_per_second(graph)
+    print("  breadth-first searches: %.0f per second (%.1f M edges "
+          "per second)" % (searches, searches * order * degree / 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Optimizes many instances (i.e., combinations of order and degree) from
+one process, with one shared pool of workers.
+CPU time is sliced among the instances, preferring those with the
+largest gap to their lower bounds.
+"""
+
+from logging import debug
+from time import time
+
+from lib.graph_elements import GolfGraph
+from lib.islands import pack, unpack
+
+
+class Instance(object):
+    """
+    An instance (i.e., a combination of order and degree) to optimize.
+    """
+
+    def __init__(self, order, degree, edges_filename=None):
+        self.order = order
+        self.degree = degree
+        self.edges_filename = edges_filename
+
+        self.graph = None
+        """
+        The best graph for this instance found so far
+        (to be initialized by the caller).
+        """
+
+    def __str__(self):
+        return "instance order=%i degree=%i" % (self.order, self.degree)
+
+    def gap(self):
+        """
+        Returns the relative gap between the total distance (i.e., the
+        average shortest path length) of the current graph and its lower
+        bound.
+        """
+        graph = self.graph
+        if graph.ideal():
+            return 0.0
+        lower_bound = graph.total_distance_lower_bound
+        return (graph.total_distance - lower_bound) / lower_bound
+
+
+def read_manifest(filename):
+    """
+    Returns a list of ``Instance``s read from the manifest ``filename``.
+
+    A manifest contains one instance per line, in the style of
+    "<order> <degree> [<edges file>]". Empty lines and lines starting
+    with "#" are ignored.
+    """
+    instances = []
+    with open(filename, "r") as open_file:
+        for line_number, line in enumerate(open_file, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fields = line.split()
+            if len(fields) not in (2, 3):
+                raise ValueError("%s:%i: expected '<order> <degree> "
+                                 "[<edges file>]'" % (filename, line_number))
+            instances.append(Instance(int(fields[0]), int(fields[1]),
+                                      *fields[2:]))
+    return instances
+
+
+def allocate(instances, slots):
+    """
+    Returns a list of length ``slots`` with one of ``instances`` per
+    slot. The slots are allocated proportionally to the instances' gaps
+    (highest averages method), i.e., instances without a gap receive no
+    slots.
+    """
+    gaps = [instance.gap() for instance in instances]
+    counts = [0] * len(instances)
+    allocated = []
+    for _ in range(slots):
+        index = max(range(len(instances)),
+                    key=lambda i: gaps[i] / (counts[i] + 1))
+        if not gaps[index]:
+            break
+        counts[index] += 1
+        allocated.append(instances[index])
+    return allocated
+
+
+def enhance_for(enhancer_cls, message, seconds, args=None):
+    """
+    Enhances the graph ``message`` (see ``lib.islands.pack``) with an
+    instance of ``enhancer_cls`` (configured by the parsed CLI ``args``,
+    if given) for ``seconds``.
+    Returns the best graph found (packed) or ``None``.
+
+    Meant to be run in a worker of a ``multiprocessing.Pool``.
+    """
+    enhancer = enhancer_cls(None)
+    if args is not None:
+        enhancer.set_args(args)
+    graph = unpack(message)
+    enhanced = False
+    deadline = time() + seconds
+
+    if not enhancer.applicable_to(graph):
+        debug("%s not applicable to %s", enhancer_cls.__name__, graph)
+        return None
+
+    while enhancer.active and time() < deadline:
+        enhanced_graph = enhancer.attempt(graph)
+        if enhanced_graph is not None:
+            graph = enhanced_graph
+            enhanced = True
+
+    if enhanced:
+        return pack(graph)
+    return None
+
+
+def new_graph(instance, load_edges):
+    """
+    Returns a new, analyzed graph for ``instance``. Edges are either
+    loaded from the instance's edges file (via ``load_edges``, which
+    receives the file name and the graph and returns the graph, possibly
+    analyzed already, e.g., ``Cli.load_analyzed_edges()``) or added
+    randomly.
+    """
+    graph = GolfGraph(instance.order, instance.degree)
+    if instance.edges_filename:
+        graph = load_edges(instance.edges_filename, graph)
+    else:
+        graph.add_as_many_random_edges_as_possible()
+    if graph.dirty:
+        graph.analyze()
+    return graph
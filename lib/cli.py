@@ -6,11 +6,22 @@ program.
 from sys import argv
 from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
 from logging import INFO, DEBUG, Formatter, getLogger, debug, info
-from multiprocessing import Process, Manager
+from multiprocessing import Process, Manager, Pool
 from datetime import datetime
+from time import time
+from queue import Empty
 
 from lib.enhancers import Registry as EnhancerRegistry
 from lib.graph_elements import GolfGraph
+from lib.scheduling import EnhancerScheduler
+from lib.islands import Island, TOPOLOGIES, unpack
+from lib.distributed import (Coordinator, Worker, serve, connect,
+                             parse_address)
+from lib import batch, edges_file
+from lib.lower_bounds import gaps
+from lib.validation import validate, ValidationError
+from lib.reports import ReportPipes
+from lib.result_cache import ResultCache
 
 class Cli(object):
     """
@@ -40,6 +51,11 @@ class Cli(object):
         self.args = None
         self.best_graph = None
 
+        self.result_cache = None
+        """
+        ``ResultCache`` of analyzed edges files, if enabled.
+        """
+
     def _init_arg_parser(self):
         """
         Adds all options to the argument parser.
@@ -59,9 +75,77 @@ class Cli(object):
         self.arg_parser.add_argument('-o', '--once', action='store_true',
                                      default=False,
                                      help="run enhancers only once")
-        self.arg_parser.add_argument('order', type=int,
+        self.arg_parser.add_argument('-a', '--adaptive', action='store_true',
+                                     default=False,
+                                     help=("assign the worker slots to "
+                                           "the registered enhancer "
+                                           "classes adaptively, according "
+                                           "to their recent success"))
+        self.arg_parser.add_argument('-i', '--islands', action='store_true',
+                                     default=False,
+                                     help=("island model: every enhancer "
+                                           "enhances its own graph and "
+                                           "migrates it periodically"))
+        self.arg_parser.add_argument('--migration-interval', type=float,
+                                     default=10.0,
+                                     help=("seconds between migrations "
+                                           "in the island model"))
+        self.arg_parser.add_argument('--topology', choices=TOPOLOGIES,
+                                     default=TOPOLOGIES[0],
+                                     help=("where islands send their "
+                                           "graphs to"))
+        self.arg_parser.add_argument('--serve', metavar='HOST:PORT',
+                                     help=("act as coordinator for "
+                                           "workers on other machines "
+                                           "(see --connect)"))
+        self.arg_parser.add_argument('--connect', metavar='HOST:PORT',
+                                     help=("act as worker node for the "
+                                           "coordinator at the given "
+                                           "address (see --serve)"))
+        self.arg_parser.add_argument('--authkey',
+                                     help=("shared secret of coordinator "
+                                           "and workers (required with "
+                                           "--serve and --connect)"))
+        self.arg_parser.add_argument('--checkpoint-interval', type=float,
+                                     default=60.0,
+                                     help=("minimum seconds between "
+                                           "writing out the best graph "
+                                           "(when coordinating)"))
+        self.arg_parser.add_argument('-b', '--batch', metavar='MANIFEST',
+                                     help=("optimize all instances listed "
+                                           "in MANIFEST (lines of '<order> "
+                                           "<degree> [<edges file>]') "
+                                           "instead of a single one"))
+        self.arg_parser.add_argument('--time-slice', type=float,
+                                     default=10.0,
+                                     help=("seconds workers spend on an "
+                                           "instance at once (in batch "
+                                           "mode)"))
+        self.arg_parser.add_argument('--screening-sources', type=int,
+                                     default=0, metavar='N',
+                                     help=("estimate the total distance "
+                                           "of modified graphs from "
+                                           "about N sources and skip "
+                                           "the analysis of clearly "
+                                           "worse ones (0 disables)"))
+        self.arg_parser.add_argument('--false-reject-rate', type=float,
+                                     default=0.01,
+                                     help=("probability to skip the "
+                                           "analysis of a graph whose "
+                                           "total distance is not "
+                                           "greater (see "
+                                           "--screening-sources; graphs "
+                                           "better only by their mspl "
+                                           "might be skipped anyway)"))
+        self.arg_parser.add_argument('--result-cache', metavar='DIR',
+                                     help=("directory to cache the "
+                                           "analysis of edges files in, "
+                                           "e.g., ~/.cache/graphgolf "
+                                           "(must not be writable for "
+                                           "others; default: none)"))
+        self.arg_parser.add_argument('order', type=int, nargs='?',
                                      help="order of the graph")
-        self.arg_parser.add_argument('degree', type=int,
+        self.arg_parser.add_argument('degree', type=int, nargs='?',
                                      help="degree of the graph")
 
     def _init_enhancers(self):
@@ -73,6 +157,13 @@ class Cli(object):
         self.enhancers = [Enhancer(self.arg_parser)
                           for Enhancer in enhancer_classes]
 
+        self.enhancers_by_class = {}
+        """
+        One initialized enhancer per registered enhancer class.
+        """
+        for enhancer in self.enhancers:
+            self.enhancers_by_class.setdefault(enhancer.__class__, enhancer)
+
     def _init_logging(self):
         """
         Configures our logger and add the arguments regarding logging to
@@ -107,6 +198,28 @@ class Cli(object):
 
         self.args = self.arg_parser.parse_args()
 
+        if not self.args.batch and (self.args.order is None or
+                                    self.args.degree is None):
+            self.arg_parser.error("order and degree are required "
+                                  "(unless running in batch mode)")
+
+        if (self.args.serve or self.args.connect) and \
+                not self.args.authkey:
+            # anyone knowing the key can run code on the coordinator
+            # (see ``lib.distributed``), so there is no default
+            self.arg_parser.error("a non-empty authkey is required "
+                                  "(see --authkey)")
+
+        if not 0 < self.args.false_reject_rate < 1:
+            self.arg_parser.error("false reject rate must be between "
+                                  "0 and 1")
+
+        for enhancer in self.enhancers:
+            enhancer.set_args(self.args)
+
+        if self.args.result_cache:
+            self.result_cache = ResultCache(self.args.result_cache)
+
         if self.args.verbose:
             getLogger().setLevel(INFO)
 
@@ -120,9 +233,24 @@ class Cli(object):
         debug("starting to run")
         self._parse_args()
 
+        if self.args.connect:
+            try:
+                self._run_worker()
+            except KeyboardInterrupt:
+                pass
+            return
+
+        if self.args.batch:
+            self._run_batch()
+            return
+
         self.best_graph = GolfGraph(self.args.order, self.args.degree)
         if self.args.edges:
-            self.load_edges()
+            try:
+                self.best_graph = self.load_analyzed_edges(self.args.edges,
+                                                           self.best_graph)
+            except (edges_file.EdgesFileError, ValidationError) as exception:
+                self.arg_parser.exit(1, "%s\n" % exception)
         else:
             self.best_graph.add_as_many_random_edges_as_possible()
 
@@ -131,12 +259,20 @@ class Cli(object):
         print("lower bound average shortest path length:",
               self.best_graph.aspl_lower_bound)
 
-        self.best_graph.analyze()
+        if self.best_graph.dirty:
+            self.best_graph.analyze()
         print("initial graph:", self.best_graph)
+        print("gap to lower bounds (diameter, total distance):",
+              gaps(self.best_graph.order, self.best_graph.degree,
+                   self.best_graph.diameter, self.best_graph.total_distance))
 
         try:
             if self.args.serial:
                 self._run_debug()
+            elif self.args.islands:
+                self._run_islands()
+            elif self.args.serve:
+                self._run_coordinator()
             else:
                 self._run()
         except KeyboardInterrupt:
@@ -148,10 +284,25 @@ class Cli(object):
         Tries to enhance the ``self.best_graph`` forever.
         Once an enhancer returns an enhanced graph, all enhancers are
         restarted therewith.
+
+        Enhancers report edge deltas and their analysis only (see
+        ``AbstractBase.enhance()``), which we apply via a (local)
+        ``Coordinator``. We trust the analysis, since re-analyzing would
+        stall all enhancers meanwhile.
         """
 
         processes = []
-        report_queue = Manager().Queue()
+        coordinator = Coordinator(self.best_graph)
+
+        scheduler = None
+        if self.args.adaptive:
+            scheduler = EnhancerScheduler(
+                [cls for cls, enhancer in self.enhancers_by_class.items()
+                 if enhancer.applicable_to(self.best_graph)],
+                len(self.enhancers)
+            )
+        classes_by_name = {cls.__name__: cls
+                           for cls in self.enhancers_by_class}
 
         while True:
 
@@ -160,24 +311,53 @@ class Cli(object):
                 print("found best graph")
                 return
 
+            if scheduler:
+                enhancers = [self.enhancers_by_class[cls]
+                             for cls in scheduler.assign()]
+                if not enhancers:
+                    print("no enhancer left")
+                    return
+            else:
+                enhancers = self.enhancers
+
             # create processes
-            for enhancer in self.enhancers:
+            reports = ReportPipes()
+            slot_classes = []
+            for enhancer in enhancers:
                 if not enhancer.applicable_to(self.best_graph):
                     debug("%s not applicable to %s", enhancer,
                           self.best_graph)
+                    if scheduler and \
+                            enhancer.__class__ in scheduler.enhancer_classes:
+                        scheduler.drop(enhancer.__class__)
                     continue
                 processes.append(
                     Process(target=enhancer.enhance,
-                            args=(self.best_graph, report_queue))
+                            args=(self.best_graph, reports.writer(),
+                                  coordinator.version()))
                 )
+                slot_classes.append(enhancer.__class__)
 
             # start processes
+            started = time()
             for process in processes:
                 debug("starting %s", process)
                 process.start()
+            reports.started()
 
             # wait for any of them
-            self.best_graph = report_queue.get()
+            report = reports.get()
+            if report is None:
+                print("no enhancer left")
+                return
+
+            # processes which ended on their own (before we kill them) and
+            # did not report deactivated themselves (see
+            # ``AbstractBase.active``)
+            ended_classes = set(
+                cls for cls, process in zip(slot_classes, processes)
+                if process.exitcode is not None
+            )
 
             # kill the rest
             while processes:
@@ -185,73 +365,288 @@ class Cli(object):
                 debug("terminating %s", process)
                 process.terminate()
 
-            # in case processes submitted a graph before they got killed
-            while not report_queue.empty():
-                self.best_graph = min(report_queue.get(), self.best_graph)
+            # also apply what processes reported before they got killed
+            improved_classes = []
+            for enhancer_name, version, removed, added, analysis in \
+                    [report] + reports.drain():
+                ended_classes.discard(classes_by_name[enhancer_name])
+                if coordinator.submit_trusted(version, removed, added,
+                                              analysis) is not None:
+                    improved_classes.append(classes_by_name[enhancer_name])
+            reports.close()
+
+            self.best_graph = coordinator.best_graph
             print("%s: %s" % (datetime.now(), self.best_graph))
 
+            if scheduler:
+                scheduler.record(slot_classes, time() - started,
+                                 improved_classes)
+                for cls in ended_classes:
+                    scheduler.drop(cls)
+                info("enhancer success rates: %s", scheduler)
+
             if self.args.once:
                 break
 
+    def _run_islands(self):
+        """
+        Like ``_run`` but every enhancer keeps enhancing its own graph
+        (island model, see ``lib.islands``). We only collect the graphs
+        islands report and keep the best.
+        """
+
+        enhancers = [enhancer for enhancer in self.enhancers
+                     if enhancer.applicable_to(self.best_graph)]
+
+        manager = Manager()
+        report_queue = manager.Queue()
+        inboxes = [manager.Queue() for _ in enhancers]
+
+        processes = [
+            Process(
+                target=Island(index, enhancer, inboxes, report_queue,
+                              self.args.migration_interval,
+                              self.args.topology).run,
+                args=(self.best_graph,)
+            )
+            for index, enhancer in enumerate(enhancers)
+        ]
+
+        for process in processes:
+            debug("starting %s", process)
+            process.start()
+
+        try:
+            while not self.best_graph.ideal():
+                # don't wait forever, if all islands are gone (e.g.,
+                # crashed or deactivated); we check before waiting, so
+                # that we don't miss their last reports
+                alive = any(process.is_alive() for process in processes)
+                try:
+                    graph = unpack(report_queue.get(timeout=1))
+                except Empty:
+                    if alive:
+                        continue
+                    print("no enhancer left")
+                    return
+                if graph < self.best_graph:
+                    self.best_graph = graph
+                    print("%s: %s" % (datetime.now(), self.best_graph))
+                    if self.args.once:
+                        break
+            else:
+                print("found best graph")
+        finally:
+            for process in processes:
+                debug("terminating %s", process)
+                process.terminate()
+
+    def _run_coordinator(self):
+        """
+        Serves ``self.best_graph`` to workers (see ``lib.distributed``)
+        and writes out the best graph every ``--checkpoint-interval``
+        seconds, if it changed.
+        """
+        coordinator = Coordinator(self.best_graph)
+        serve(coordinator, parse_address(self.args.serve),
+              self.args.authkey)
+
+        version = coordinator.version()
+        checkpointed_version = version
+        next_checkpoint = time() + self.args.checkpoint_interval
+
+        while not self.best_graph.ideal():
+
+            new_version = coordinator.wait_for_improvement(
+                version, self.args.checkpoint_interval
+            )
+            if new_version != version:
+                version = new_version
+                self.best_graph = coordinator.best_graph
+                print("%s: %s" % (datetime.now(), self.best_graph))
+                if self.args.once:
+                    return
+
+            if time() >= next_checkpoint and version != checkpointed_version:
+                self.write_edges()
+                checkpointed_version = version
+                next_checkpoint = time() + self.args.checkpoint_interval
+        else:
+            print("found best graph")
+
+    def _run_worker(self):
+        """
+        Runs one worker process per registered enhancer, which enhance
+        the incumbent of the coordinator at ``--connect``.
+        """
+        address = parse_address(self.args.connect)
+
+        # make sure we fail early if the coordinator is unreachable
+        version, graph = connect(address, self.args.authkey).incumbent()
+        if (graph.order, graph.degree) != (self.args.order, self.args.degree):
+            raise ValueError(
+                "coordinator works on order %i and degree %i" %
+                (graph.order, graph.degree)
+            )
+        info("coordinator is at version %i", version)
+
+        processes = [
+            Process(target=Worker(enhancer, address, self.args.authkey).run)
+            for enhancer in self.enhancers
+        ]
+        for process in processes:
+            debug("starting %s", process)
+            process.start()
+        for process in processes:
+            process.join()
+
+    def _run_batch(self):
+        """
+        Optimizes all instances of the manifest ``--batch`` with one pool
+        of workers (see ``lib.batch``). Every improved graph is written
+        out after the time slice it was found in.
+        """
+        instances = batch.read_manifest(self.args.batch)
+        for instance in instances:
+            try:
+                instance.graph = batch.new_graph(instance,
+                                                 self.load_analyzed_edges)
+            except (edges_file.EdgesFileError, ValidationError) as exception:
+                self.arg_parser.exit(1, "%s\n" % exception)
+            print("initial graph for %s: %s" % (instance, instance.graph))
+
+        enhancer_classes = [enhancer.__class__ for enhancer in self.enhancers]
+        slots = len(enhancer_classes)
+
+        with Pool(slots) as pool:
+            try:
+                while True:
+
+                    allocated = batch.allocate(instances, slots)
+                    if not allocated:
+                        print("found best graphs")
+                        return
+
+                    results = [
+                        pool.apply_async(batch.enhance_for, (
+                            enhancer_classes[slot],
+                            batch.pack(instance.graph),
+                            self.args.time_slice,
+                            self.args
+                        ))
+                        for slot, instance in enumerate(allocated)
+                    ]
+
+                    improved = []
+                    for instance, result in zip(allocated, results):
+                        message = result.get()
+                        if message is None:
+                            continue
+                        graph = batch.unpack(message)
+                        if graph < instance.graph:
+                            instance.graph = graph
+                            if instance not in improved:
+                                improved.append(instance)
+
+                    for instance in improved:
+                        print("%s: %s: %s" % (datetime.now(), instance,
+                                              instance.graph))
+                        self.write_edges(instance.graph)
+
+                    if self.args.once:
+                        return
+            except KeyboardInterrupt:
+                pass
+
     def _run_debug(self):
         """
         Like ``_run`` but w/o forking processes and parallelism.
         **MAKES NO ACTUAL PROGRESS** - solely for debugging purposes.
         """
-        report_queue = Manager().Queue()
+        reports = ReportPipes()
+        report_writer = reports.writer()
+        coordinator = Coordinator(self.best_graph)
         while True:
             for enhancer in self.enhancers:
                 if enhancer.applicable_to(self.best_graph):
-                    enhancer.enhance(self.best_graph, report_queue)
-                    self.best_graph = report_queue.get()
+                    enhancer.enhance(self.best_graph, report_writer,
+                                     coordinator.version())
+                    for report in reports.drain():
+                        coordinator.submit_trusted(*report[1:])
+                    self.best_graph = coordinator.best_graph
 
             if self.args.once:
                 break
+        reports.close()
 
-    def current_edges_filename(self):
+    def current_edges_filename(self, graph=None):
         """
-        Returns the file name of the current edges file.
+        Returns the file name of the current edges file
+        (of ``graph``, defaults to ``self.best_graph``).
         """
+        graph = graph or self.best_graph
 
-        assert self.best_graph.diameter is not None
-        assert self.best_graph.aspl is not None
+        assert graph.diameter is not None
+        assert graph.aspl is not None
 
         return "-".join((
             "edges",
-            "order=%i" % self.best_graph.order,
-            "degree=%i" % self.best_graph.degree,
-            "diameter=%i" % self.best_graph.diameter,
-            "aspl=%f" % self.best_graph.aspl
+            "order=%i" % graph.order,
+            "degree=%i" % graph.degree,
+            "diameter=%i" % graph.diameter,
+            "aspl=%f" % graph.aspl
         ))
 
-    def write_edges(self):
+    def write_edges(self, graph=None):
         """
-        Writes the best graph to a file.
-
-        #refactoring: maybe this should be moved to another/separate class?
+        Writes the best graph (or ``graph``) to a file.
         """
-        assert self.best_graph.diameter is not None
-        assert self.best_graph.aspl is not None
+        graph = graph or self.best_graph
+
+        assert graph.diameter is not None
+        assert graph.aspl is not None
 
         info("writing out best graph found")
 
-        with open(self.current_edges_filename(), mode="w") as open_file:
-            open_file.writelines(("%i %i\n" % (v1.id, v2.id)
-                                  for v1, v2 in self.best_graph.edges()))
+        filename = self.current_edges_filename(graph)
+        edges_file.write_edges(filename, graph)
+        if self.result_cache is not None:
+            self.result_cache.put(filename, graph)
 
-    def load_edges(self, override_filename=None):
+    def load_edges(self, override_filename=None, graph=None):
         """
-        Loads edges form the file specified in ``self.args`` into
-        ``self.best_graph``.
+        Loads edges form the file specified in ``self.args`` (or
+        ``override_filename``) into ``self.best_graph`` (or ``graph``).
 
-        #refactoring: maybe this should be moved to another/separate class?
+        Raises ``ValidationError`` if the edges do not form a valid
+        graph.
         """
         filename = override_filename or self.args.edges
-        with open(filename, "r") as open_file:
-            for line in open_file.readlines():
-                line = line.strip()
-                vertex_a_id, vertex_b_id = line.split(" ")
-                self.best_graph.add_edge_unsafe(
-                    self.best_graph.vertices[int(vertex_a_id)],
-                    self.best_graph.vertices[int(vertex_b_id)],
-                )
+        graph = graph or self.best_graph
+
+        edge_ids = edges_file.read_edge_ids(filename)
+        report = validate(graph.order, graph.degree, edge_ids)
+        info("validated %s:\n%s", filename, report)
+        if not report.ok:
+            raise ValidationError(report)
+
+        graph.add_edge_ids_unsafe(edge_ids)
+
+    def load_analyzed_edges(self, filename, graph):
+        """
+        Loads the edges of ``filename`` into ``graph`` (see
+        ``load_edges()``) and analyzes it, unless the analysis is in
+        ``self.result_cache`` already. Returns the analyzed graph, i.e.,
+        the cached one in the latter case.
+        """
+        if self.result_cache is not None:
+            cached_graph = self.result_cache.get(filename, graph.order,
+                                                 graph.degree)
+            if cached_graph is not None:
+                return cached_graph
+
+        self.load_edges(filename, graph)
+        graph.analyze()
+        if self.result_cache is not None:
+            self.result_cache.put(filename, graph)
+        return graph
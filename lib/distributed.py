@@ -0,0 +1,304 @@
+"""
+Distributed search over TCP: a coordinator owns the incumbent graph
+(and checkpointing), workers - possibly on many machines - pull the
+incumbent, enhance it and push improvements as edge deltas.
+
+Based on ``multiprocessing.managers``, so all you need is a common
+``authkey``. Please be aware that this uses ``pickle`` and hence, must
+only be used in trusted networks.
+"""
+
+from logging import debug, info, warning
+from threading import Condition, Thread
+from multiprocessing.managers import BaseManager
+from time import time
+
+from lib.graph_elements import GolfGraph, GraphPartitionedError
+
+
+def parse_address(address):
+    """
+    Returns a tuple (host, port) for an ``address`` like "host:port".
+    """
+    host, _, port = address.rpartition(":")
+    return host, int(port)
+
+
+class Coordinator(object):
+    """
+    Holds the incumbent graph and accepts improvements to it.
+
+    The methods in ``EXPOSED`` are called remotely by workers
+    (concurrently, from the server's threads). The local coordination
+    (see ``Cli._run()``) applies the reports of enhancers through
+    ``submit_trusted()``.
+    """
+
+    EXPOSED = ("version", "incumbent", "submit", "wait_for_improvement")
+    """
+    Names of the methods workers may call, see ``serve()``.
+    """
+
+    def __init__(self, graph):
+        """
+        ``graph`` is the initial, analyzed incumbent.
+        """
+        assert not graph.dirty, "graph must be analyzed"
+        self.best_graph = graph
+        self._version = 0
+        self._improved = Condition()
+
+    def version(self):
+        """
+        Returns the version of the incumbent (increases with every
+        accepted improvement).
+        """
+        return self._version
+
+    def incumbent(self):
+        """
+        Returns a tuple of the version and the incumbent (which is
+        pickled compactly, see ``GolfGraph.__getstate__()``).
+        """
+        with self._improved:
+            return self._version, self.best_graph
+
+    def submit(self, version, removed, added, metrics=None):
+        """
+        Applies the edge delta (``removed`` and ``added`` edges, as
+        returned by ``GolfGraph.edge_delta()``) to the incumbent, and
+        accepts the result if it is better.
+
+        The delta was computed against the incumbent of ``version``.
+        If the incumbent changed in the meantime, we try to apply the
+        delta to the current incumbent anyway.
+
+        If given, the ``metrics`` (see ``GolfGraph.metrics()``) the
+        submitter found for the result allow to skip the analysis of
+        deltas which would not be better anyway. They are never trusted
+        otherwise, i.e., accepted results are always re-analyzed.
+
+        Returns the new version if accepted, ``None`` otherwise.
+        """
+        with self._improved:
+            if version != self._version:
+                debug("applying delta of version %i to version %i",
+                      version, self._version)
+                # the reported metrics are of another base graph
+                metrics = None
+
+            if metrics is not None and \
+                    not GolfGraph.better(metrics, self.best_graph.metrics()):
+                debug("rejected delta w/o improvement")
+                return None
+
+            graph = self.best_graph.duplicate()
+            if not self._apply(graph, removed, added):
+                return None
+
+            try:
+                graph.analyze()
+            except GraphPartitionedError:
+                warning("rejected partitioned graph")
+                return None
+
+            if metrics is not None and tuple(metrics) != graph.metrics():
+                warning("reported metrics %s do not match %s",
+                        metrics, graph.metrics())
+
+            return self._accept(graph)
+
+    def submit_trusted(self, version, removed, added, analysis):
+        """
+        Like ``submit()``, but trusts the ``analysis`` (see
+        ``GolfGraph.analysis()``) the submitter found for the result,
+        i.e., spares the re-analysis, unless the incumbent changed in
+        the meantime. Only for reports of our own enhancer processes,
+        hence not exposed to workers.
+
+        Returns the new version if accepted, ``None`` otherwise.
+        """
+        with self._improved:
+            if version != self._version:
+                debug("applying delta of version %i to version %i",
+                      version, self._version)
+                return self.submit(version, removed, added)
+
+            graph = self.best_graph.duplicate()
+            if not self._apply(graph, removed, added):
+                return None
+            graph.restore_analysis(analysis)
+            assert graph.metrics() == self._reanalyzed(graph).metrics(), \
+                   "reported analysis does not match the graph"
+
+            return self._accept(graph)
+
+    def _accept(self, graph):
+        """
+        Makes the analyzed ``graph`` the incumbent, if it is better.
+        Returns the new version if so, ``None`` otherwise.
+        """
+        if not graph < self.best_graph:
+            return None
+
+        self.best_graph = graph
+        self._version += 1
+        self._improved.notify_all()
+        return self._version
+
+    @staticmethod
+    def _reanalyzed(graph):
+        """
+        Returns a newly analyzed duplicate of ``graph`` (to verify its
+        analysis).
+        """
+        reanalyzed = GolfGraph(graph.order, graph.degree)
+        reanalyzed.add_edge_ids_unsafe(graph.edge_ids())
+        reanalyzed.analyze()
+        return reanalyzed
+
+    @staticmethod
+    def _apply(graph, removed, added):
+        """
+        Applies the edge delta to ``graph``, but checks all constraints
+        first, since we cannot trust remote input.
+        Returns whether the delta could be applied.
+        """
+        vertices = graph.vertices
+        order = graph.order
+        try:
+            for vertex_a_id, vertex_b_id in removed:
+                if not (0 <= vertex_a_id < order and 0 <= vertex_b_id < order):
+                    return False
+                vertex_a = vertices[vertex_a_id]
+                vertex_b = vertices[vertex_b_id]
+                if vertex_b not in vertex_a.edges_index:
+                    return False
+                graph.remove_edge_unsafe(vertex_a, vertex_b)
+            for vertex_a_id, vertex_b_id in added:
+                if not (0 <= vertex_a_id < order and 0 <= vertex_b_id < order):
+                    return False
+                vertex_a = vertices[vertex_a_id]
+                vertex_b = vertices[vertex_b_id]
+                if (vertex_a is vertex_b or
+                        vertex_b in vertex_a.edges_index or
+                        len(vertex_a.edges_to) == graph.degree or
+                        len(vertex_b.edges_to) == graph.degree):
+                    return False
+                graph.add_edge_unsafe(vertex_a, vertex_b)
+        except (TypeError, ValueError):
+            return False
+        return True
+
+    def wait_for_improvement(self, version, timeout):
+        """
+        Blocks until the incumbent is newer than ``version`` or
+        ``timeout`` seconds passed. Returns the current version.
+        """
+        with self._improved:
+            if self._version == version:
+                self._improved.wait(timeout)
+            return self._version
+
+
+def serve(coordinator, address, authkey):
+    """
+    Serves ``coordinator`` at ``address`` (tuple of host and port) in a
+    background thread. Returns the server (see attribute ``address``).
+    """
+    class CoordinatorManager(BaseManager):
+        """ Serves the coordinator. """
+    CoordinatorManager.register("coordinator", callable=lambda: coordinator,
+                                exposed=Coordinator.EXPOSED)
+
+    server = CoordinatorManager(address=address,
+                                authkey=authkey.encode()).get_server()
+    Thread(target=server.serve_forever, daemon=True).start()
+    info("coordinator listening at %s:%i", *server.address)
+    return server
+
+
+def connect(address, authkey):
+    """
+    Returns a proxy to the coordinator at ``address`` (tuple of host and
+    port).
+    """
+    class CoordinatorManager(BaseManager):
+        """ Connects to the coordinator. """
+    CoordinatorManager.register("coordinator")
+
+    manager = CoordinatorManager(address=address, authkey=authkey.encode())
+    manager.connect()
+    return manager.coordinator()
+
+
+class Worker(object):
+    """
+    Enhances the incumbent of a remote coordinator.
+
+    After initialization, all you need is ``run()`` (which is meant to be
+    the target of a process).
+    """
+
+    POLL_INTERVAL = 5.0
+    """
+    Seconds between checks whether the coordinator has a new incumbent.
+    """
+
+    def __init__(self, enhancer, address, authkey):
+        self.enhancer = enhancer
+        self.address = address
+        self.authkey = authkey
+        self.coordinator = None
+        self.version = None
+        self.incumbent = None
+
+    def __str__(self):
+        return "worker (%s)" % self.enhancer.__class__.__name__
+
+    def pull(self):
+        """
+        Fetches the coordinator's incumbent.
+        """
+        version, graph = self.coordinator.incumbent()
+        debug("%s pulled version %i", self, version)
+        self.version = version
+        self.incumbent = graph
+
+    def run(self):
+        """
+        Enhances the coordinator's incumbent forever.
+        """
+        self.coordinator = connect(self.address, self.authkey)
+        self.pull()
+
+        if not self.enhancer.applicable_to(self.incumbent):
+            info("%s not applicable to %s", self, self.incumbent)
+            return
+
+        next_poll = time() + self.POLL_INTERVAL
+
+        while self.enhancer.active:
+
+            enhanced_graph = self.enhancer.attempt(self.incumbent)
+            if enhanced_graph is not None:
+                removed, added = self.incumbent.edge_delta(enhanced_graph)
+                version = self.coordinator.submit(self.version, removed,
+                                                  added,
+                                                  enhanced_graph.metrics())
+                if version is None:
+                    debug("%s: submission rejected", self)
+                    self.pull()
+                elif version == self.version + 1:
+                    info("%s found %s", self, enhanced_graph)
+                    self.version = version
+                    self.incumbent = enhanced_graph
+                else:
+                    # accepted, but applied to a newer incumbent
+                    self.pull()
+                continue
+
+            if time() >= next_poll:
+                if self.coordinator.version() != self.version:
+                    self.pull()
+                next_poll = time() + self.POLL_INTERVAL
@@ -0,0 +1,97 @@
+"""
+Reading and writing of edges files (plain text files with one edge per
+line, in the style of "<vertex ID> <vertex ID>").
+
+Both directions stream, i.e., we never hold the whole file in memory
+(only the edges, as compact array of vertex IDs, when reading). Files
+compressed with gzip are read transparently, and written if the file
+name ends with ".gz".
+"""
+
+from gzip import open as gzip_open
+from logging import debug
+from array import array
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+CHUNK_SIZE = 1 << 20
+"""
+Approximate number of bytes to read at once.
+"""
+
+
+class EdgesFileError(ValueError):
+    """
+    Raised when an edges file does not describe a valid graph.
+    """
+
+    def __init__(self, filename, line_number, message):
+        super().__init__("%s:%i: %s" % (filename, line_number, message))
+        self.filename = filename
+        self.line_number = line_number
+
+
+def open_edges_file(filename, mode):
+    """
+    Opens the edges file ``filename`` in text ``mode`` ("r" or "w"),
+    (de)compressing with gzip if applicable.
+    """
+    assert mode in ("r", "w")
+    if mode == "r":
+        with open(filename, "rb") as open_file:
+            compressed = open_file.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+    else:
+        compressed = filename.endswith(".gz")
+
+    if compressed:
+        debug("opening %s with gzip", filename)
+        return gzip_open(filename, mode + "t")
+    return open(filename, mode)
+
+
+def read_edge_ids(filename):
+    """
+    Returns the edges from ``filename`` as flat array of vertex IDs
+    (see ``GolfGraph.edge_ids()``), without checking whether they form a
+    valid graph (see ``lib.validation``).
+
+    Raises ``EdgesFileError`` for malformed lines.
+    """
+    edge_ids = array("q")
+    append = edge_ids.append
+
+    line_number = 0
+    with open_edges_file(filename, "r") as open_file:
+        while True:
+            lines = open_file.readlines(CHUNK_SIZE)
+            if not lines:
+                break
+            for line in lines:
+                line_number += 1
+
+                fields = line.split()
+                if not fields:
+                    continue
+                try:
+                    vertex_a_id, vertex_b_id = map(int, fields)
+                    append(vertex_a_id)
+                    append(vertex_b_id)
+                except (ValueError, OverflowError):
+                    raise EdgesFileError(filename, line_number,
+                                         "expected two vertex IDs")
+
+    return edge_ids
+
+
+def write_edges(filename, graph):
+    """
+    Writes the edges of ``graph`` to ``filename``.
+    """
+    with open_edges_file(filename, "w") as open_file:
+        for vertex_a in graph.vertices:
+            vertex_a_id = vertex_a.id
+            open_file.writelines(
+                "%i %i\n" % (vertex_a_id, vertex_b.id)
+                for vertex_b in vertex_a.edges_to
+                if vertex_a_id < vertex_b.id
+            )
@@ -3,11 +3,15 @@ This module contains classes that enhance a graph.
 """
 
 from abc import ABCMeta
-from random import sample
+from random import sample, expovariate, choice
+from heapq import nlargest
 from logging import debug, info, warning
 from itertools import combinations, chain
+from collections import OrderedDict
 
 from lib.graph_elements import GraphPartitionedError
+from lib.screening import Screening
+from lib import scoring
 
 
 class Registry(object):
@@ -31,6 +35,7 @@ class Registry(object):
         def _register_multiple(enhancer_cls):
             for _ in range(times):
                 cls.register(enhancer_cls)
+            return enhancer_cls
         return _register_multiple
 
     @classmethod
@@ -56,6 +61,31 @@ class AbstractBase(object):
 
     __metaclass__ = ABCMeta
 
+    AVOID_BRIDGES = False
+    """
+    Whether ``remove_random_edge`` removes only edges that are no bridges
+    (i.e., never partitions the graph) by default.
+    Off by default, since the enhancers below relink randomly after
+    removing edges anyway, what reconnected the partitions in all of our
+    experiments with random graphs of degree three; so the (linear time)
+    recomputation of the bridges after every removal did not pay off
+    there. Enable for graphs with many bridges.
+    """
+
+    DIAMETER_FIRST = True
+    """
+    Whether ``attempt()`` rejects graphs with a greater diameter than the
+    best graph, as long as the diameter is above its lower bound.
+    This allows to stop analyzing those graphs early.
+    """
+
+    SEEN_CAPACITY = 4096
+    """
+    Number of fingerprints (see ``GolfGraph.fingerprint``) of recently
+    modified graphs ``attempt()`` remembers to skip them, if they come
+    up again.
+    """
+
     def __init__(self, arg_parser):
         self.arg_parser = arg_parser
         self.args = None
@@ -66,11 +96,33 @@ class AbstractBase(object):
         be no more progress.
         """
 
+        self.statistics = {"attempts": 0, "seen": 0, "partitioned": 0,
+                           "greater diameter": 0, "screened out": 0}
+        """
+        Counters of what happened to the modified graphs in ``attempt()``.
+        """
+
+        self.screening = None
+        """
+        Optional ``Screening`` of modified graphs before their analysis.
+        """
+
+        self._seen = OrderedDict()
+        """
+        Fingerprints of recently modified graphs, least recent first,
+        since the best graph of fingerprint ``_seen_of`` became the best.
+        """
+
+        self._seen_of = None
+
     def set_args(self, args):
         """
         Called to set the parsed CLI arts for instance.
         """
         self.args = args
+        if args.screening_sources:
+            self.screening = Screening(args.screening_sources,
+                                       args.false_reject_rate)
 
 
     def applicable_to(self, graph):
@@ -81,10 +133,18 @@ class AbstractBase(object):
         # return whether graph is fully connected
         return graph.order > graph.degree-1
 
-    def enhance(self, best_graph, report_queue):
+    def enhance(self, best_graph, report_queue, version=0):
         """
         Tries to enhance a graph; possibly **IN PLACE**.
-        Puts an enhanced graph into the ``report_queue``, when found.
+        When found an enhanced graph, puts a tuple of the name of this
+        enhancer's class, the ``version`` of ``best_graph``, the removed
+        and the added edges (see ``GolfGraph.edge_delta()``) and the
+        analysis of the enhanced graph (see ``GolfGraph.analysis()``)
+        into the ``report_queue``.
+
+        I.e., we do not send the whole graph, but only what is needed to
+        reconstruct it from ``best_graph`` w/o analyzing it again (see
+        ``lib.distributed.Coordinator.submit_trusted()``).
         """
         debug("enhancer %s started", self.__class__.__name__)
 
@@ -97,27 +157,75 @@ class AbstractBase(object):
             return
 
         while self.active:
+            current_graph = self.attempt(best_graph)
+            if current_graph is not None:
+                info("%s found %s (%s)", self.__class__.__name__,
+                     current_graph, self.statistics)
+                removed, added = best_graph.edge_delta(current_graph)
+                report_queue.put((self.__class__.__name__, version,
+                                  removed, added, current_graph.analysis()))
+                return
 
-            # get a new copy of best graph to work with
-            current_graph = best_graph.duplicate()
+    def attempt(self, best_graph):
+        """
+        Modifies a duplicate of ``best_graph`` once and returns it, if it
+        is better than ``best_graph``. Returns ``None`` otherwise.
 
-            # get a modified graph
-            try:
-                current_graph = self.modify_graph(current_graph)
-                if current_graph.dirty:
-                    current_graph.analyze()
-            except GraphPartitionedError:
-                debug("graph partitioned")
-                continue
+        As long as the diameter of ``best_graph`` is above its lower
+        bound, reducing the diameter is what matters most (see
+        ``DIAMETER_FIRST``).
+        """
+
+        statistics = self.statistics
+        statistics["attempts"] += 1
+
+        # get a new copy of best graph to work with
+        current_graph = best_graph.duplicate()
 
+        # get a modified graph
+        try:
+            current_graph = self.modify_graph(current_graph)
             if not current_graph:
-                warning("%s did not return a graph", self.__class__.__name__)
-                return
+                warning("%s did not return a graph",
+                        self.__class__.__name__)
+                self.active = False
+                return None
+            if current_graph.dirty:
+                # a graph which was not better than this best graph
+                # before will not be better this time either
+                if self.seen(current_graph, best_graph):
+                    statistics["seen"] += 1
+                    return None
+                # cheap check before the expensive analysis
+                if not current_graph.connected():
+                    raise GraphPartitionedError()
+                if self.screening is not None and \
+                        self.screening.rejects(current_graph, best_graph):
+                    statistics["screened out"] += 1
+                    return None
+                if self.DIAMETER_FIRST and \
+                        best_graph.diameter > best_graph.diameter_lower_bound:
+                    # the formerly most distant vertices are likely to
+                    # reveal a greater diameter soonest
+                    vertices = current_graph.vertices
+                    if not current_graph.analyze(
+                            best_graph.diameter,
+                            [vertices[vertex.id] for vertex
+                             in best_graph.peripheral_vertices()]
+                    ):
+                        statistics["greater diameter"] += 1
+                        return None
+                else:
+                    current_graph.analyze()
+        except GraphPartitionedError:
+            debug("graph partitioned")
+            statistics["partitioned"] += 1
+            return None
 
-            if current_graph < best_graph:
-                info("%s found %s", self.__class__.__name__, current_graph)
-                report_queue.put(current_graph)
-                return
+        if current_graph < best_graph:
+            return current_graph
+
+        return None
 
     def modify_graph(self, graph):
         """
@@ -125,19 +233,55 @@ class AbstractBase(object):
         """
         raise NotImplementedError("subclass responsibility")
 
+    def seen(self, graph, best_graph):
+        """
+        Returns whether ``graph`` (likely) equals ``best_graph`` or one of
+        the last ``SEEN_CAPACITY`` graphs passed with the same
+        ``best_graph``, and remembers it.
+
+        We forget all graphs whenever ``best_graph`` changes, since
+        "better" (see ``GolfGraph.__lt__``) is no total order, i.e., a
+        graph which was not better than a former best graph might be
+        better than the current one.
+        """
+        fingerprint = graph.fingerprint
+        if fingerprint == best_graph.fingerprint:
+            return True
+        seen = self._seen
+        if best_graph.fingerprint != self._seen_of:
+            seen.clear()
+            self._seen_of = best_graph.fingerprint
+        if fingerprint in seen:
+            seen.move_to_end(fingerprint)
+            return True
+        seen[fingerprint] = None
+        if len(seen) > self.SEEN_CAPACITY:
+            seen.popitem(last=False)
+        return False
+
     def remove_random_edge(self, graph, vertex,
-                           allow_complete_disconnect=True):
+                           allow_complete_disconnect=True,
+                           avoid_bridges=None):
         """
         Removes a random edge from ``vertex``.
         If not ``allow_complete_disconnect``, this method will take care
         of not disconnecting vertices from the graph completely.
+        If ``avoid_bridges`` (defaults to ``AVOID_BRIDGES``), only edges
+        which are no bridges are removed, i.e., the graph stays
+        connected. This implies not disconnecting vertices completely.
 
         For your concrete enhancer, please test if the different settings
         for ``allow_complete_disconnect``. I found that allowing to
         disconnect vertices from the graph completely gave better results
         (of course, only if you relink them afterwards).
+        The bridges are recomputed (in linear time) after every removal,
+        what is cheap compared to the analysis of a partitioned graph.
         """
+        if avoid_bridges is None:
+            avoid_bridges = self.AVOID_BRIDGES
         for edge_to in sample(vertex.edges_to, len(vertex.edges_to)):
+            if avoid_bridges and graph.is_bridge(vertex, edge_to):
+                continue
             if len(edge_to.edges_to) > 1 or allow_complete_disconnect:
                 graph.remove_edge_unsafe(vertex, edge_to)
                 return edge_to
@@ -179,7 +323,7 @@ class AbstractBase(object):
 
         # find longest paths and remember them
         for vertex_a, vertex_b in combinations(graph.vertices, 2):
-            hops_count = len(graph.hops(vertex_a, vertex_b))
+            hops_count = graph.hops_count(vertex_a, vertex_b)
             if hops_count == hops_count_max:
                 longest_paths.append((vertex_a, vertex_b))
             elif hops_count > hops_count_max:
@@ -377,6 +521,64 @@ class AbstractRandomlyReplaceRandomEdges(AbstractRandomlyRelinkVertices):
 
 
 
+class AbstractRandomlyReplaceEdgesOfRemoteVertices(
+        AbstractRandomlyReplaceRandomEdges
+):
+    """
+    Like ``AbstractRandomlyReplaceRandomEdges`` but prefers vertices far
+    away from the others (i.e., with a high eccentricity and sum of
+    distances), since replacing their edges is more likely to shorten
+    the longest paths.
+    """
+
+    __metaclass__ = ABCMeta
+
+    WEIGHT_BASE = 4
+    """
+    A vertex is ``WEIGHT_BASE`` times more likely to be considered than
+    a vertex with an eccentricity less by one (given equal sums of
+    distances).
+    """
+
+    def __init__(self, arg_parser):
+        super().__init__(arg_parser)
+        self._weights_of = None
+        self._weights = None
+
+    def weights(self, graph):
+        """
+        Returns the weight of every vertex (by ID) of the analyzed
+        ``graph``.
+
+        Computed once per analysis (duplicates share the analysis
+        results until they are analyzed again).
+        """
+        eccentricities = graph.eccentricities
+        if eccentricities is not self._weights_of:
+            diameter = graph.diameter
+            self._weights = [
+                distance_sum * self.WEIGHT_BASE ** (eccentricity - diameter)
+                for eccentricity, distance_sum
+                in zip(eccentricities, graph.distance_sums)
+            ]
+            self._weights_of = eccentricities
+        return self._weights
+
+    def vertices_to_consider(self, graph):
+        """
+        Returns a weighted random sample (see ``weights()``) of size
+        ``_number_of_edges_to_replace`` of vertices to consider.
+        """
+        # weighted sampling w/o replacement (Efraimidis and Spirakis;
+        # the keys are the logarithms of ``random() ** (1 / weight)``)
+        weights = self.weights(graph)
+        return nlargest(
+            self._number_of_edges_to_replace(graph), graph.vertices,
+            key=lambda vertex: -expovariate(1) / weights[vertex.id]
+        )
+
+
+
 class AbstractRandomlyReplacePercentageOfEdges(
         AbstractRandomlyReplaceRandomEdges
 ):
@@ -396,6 +598,194 @@ class AbstractRandomlyReplacePercentageOfEdges(
 
 
 
+class TabuSearch(AbstractBase):
+    """
+    Walks away from the best graph by swapping the ends of two edges at a
+    time (what keeps the degrees of all vertices).
+
+    Every step evaluates ``CANDIDATES`` random swaps (see
+    ``lib.scoring``) and takes the best one which is not tabu - even if
+    it makes the graph worse, what lets the walk escape from local
+    optima. Edges removed or added are tabu (i.e., must not be removed
+    or added again) for the next ``TENURE`` steps, so that the walk does
+    not simply return. Swaps which would yield the best graph of the
+    walk so far are allowed even if tabu ("aspiration").
+    """
+
+    CANDIDATES = 16
+    """
+    Number of swaps evaluated per step.
+    """
+
+    TENURE = 16
+    """
+    Number of steps edges are tabu after they have been removed or added.
+    """
+
+    def __init__(self, arg_parser):
+        super().__init__(arg_parser)
+
+        self.statistics["swaps evaluated"] = 0
+
+        self._step = 0
+
+        self._tabu = {}
+        """
+        Steps until which edges are tabu, by edge key (see ``_key()``).
+        """
+
+        self._walk_of = None
+        """
+        The best graph the current walk started from.
+        """
+
+        self._walk = None
+        self._score = None
+        self._best_score = None
+        """
+        Scores (see ``lib.scoring.score``) of the current graph of the
+        walk and of the best graph found on the walk so far.
+        """
+
+        self._neighbours_of = None
+        self._neighbours = None
+
+    @staticmethod
+    def _key(vertex_a_id, vertex_b_id):
+        """
+        Returns a hashable key for the edge between the two vertices.
+        """
+        if vertex_a_id < vertex_b_id:
+            return vertex_a_id << 32 | vertex_b_id
+        return vertex_b_id << 32 | vertex_a_id
+
+    def attempt(self, best_graph):
+        """
+        Makes one step of the walk and returns the graph of the walk, if
+        it is better than ``best_graph``. Returns ``None`` otherwise.
+        A new walk starts whenever ``best_graph`` changes.
+        """
+        self.statistics["attempts"] += 1
+
+        if best_graph is not self._walk_of:
+            debug("%s starts a new walk", self.__class__.__name__)
+            self._walk_of = best_graph
+            self._walk = best_graph.duplicate()
+            self._score = (best_graph.diameter, best_graph.total_distance)
+            self._best_score = self._score
+            self._tabu = {}
+
+        if self.modify_graph(self._walk) is None:
+            return None
+
+        if self._score < self._best_score:
+            self._best_score = self._score
+            graph = self._walk.duplicate()
+            graph.analyze()
+            if graph < best_graph:
+                return graph
+
+        return None
+
+    def modify_graph(self, graph):
+        """
+        Makes one step of the walk on ``graph`` (in place) and returns it.
+        Returns ``None`` if there was no swap to make.
+        """
+        if graph is not self._neighbours_of:
+            self._neighbours_of = graph
+            self._neighbours = scoring.neighbours(graph)
+            if graph is not self._walk:
+                self._score = scoring.score(self._neighbours)
+                self._best_score = self._score
+
+        vertices = graph.vertices
+        degree = graph.degree
+        tabu = self._tabu
+        key = self._key
+        step = self._step
+
+        swaps = []
+        tabu_swaps = []
+        for _ in range(self.CANDIDATES):
+
+            # draw two random edges, the swap wires a-c and b-d
+            vertex_a = choice(vertices)
+            vertex_c = choice(vertices)
+            if not vertex_a.edges_to or not vertex_c.edges_to:
+                continue
+            vertex_b = choice(vertex_a.edges_to)
+            vertex_d = choice(vertex_c.edges_to)
+            if (vertex_c is vertex_a or vertex_c is vertex_b or
+                    vertex_d is vertex_a or vertex_d is vertex_b or
+                    vertex_c in vertex_a.edges_index or
+                    vertex_d in vertex_b.edges_index):
+                continue
+            # vertices w/ ports left must stay wired to each other
+            if (len(vertex_a.edges_to) < degree and
+                    len(vertex_b.edges_to) < degree or
+                    len(vertex_c.edges_to) < degree and
+                    len(vertex_d.edges_to) < degree):
+                continue
+
+            a_id, b_id, c_id, d_id = swap = (vertex_a.id, vertex_b.id,
+                                             vertex_c.id, vertex_d.id)
+            if (tabu.get(key(a_id, b_id), -1) > step or
+                    tabu.get(key(c_id, d_id), -1) > step or
+                    tabu.get(key(a_id, c_id), -1) > step or
+                    tabu.get(key(b_id, d_id), -1) > step):
+                tabu_swaps.append(swap)
+            else:
+                swaps.append(swap)
+
+        # the tabu swaps come last, so that they do not spoil the bound
+        # for the others, but only the best swap keeps its score (see
+        # ``score_swaps()``); tabu swaps must beat the best of the walk
+        best_swap = None
+        best_swap_score = None
+        if swaps or tabu_swaps:
+            scores = scoring.score_swaps(self._neighbours, swaps + tabu_swaps)
+            self.statistics["swaps evaluated"] += len(scores)
+            for index, (swap, swap_score) in enumerate(zip(swaps + tabu_swaps,
+                                                           scores)):
+                if swap_score is None:
+                    continue
+                if index >= len(swaps) and not swap_score < self._best_score:
+                    continue
+                if best_swap_score is None or swap_score < best_swap_score:
+                    best_swap = swap
+                    best_swap_score = swap_score
+
+        self._step += 1
+        if best_swap is None:
+            debug("%s found no swap to make", self.__class__.__name__)
+            return None
+
+        a_id, b_id, c_id, d_id = best_swap
+        vertex_a, vertex_b, vertex_c, vertex_d = (vertices[a_id],
+                                                  vertices[b_id],
+                                                  vertices[c_id],
+                                                  vertices[d_id])
+        graph.remove_edge_unsafe(vertex_a, vertex_b)
+        graph.remove_edge_unsafe(vertex_c, vertex_d)
+        graph.add_edge_unsafe(vertex_a, vertex_c)
+        graph.add_edge_unsafe(vertex_b, vertex_d)
+        scoring.swap(self._neighbours, best_swap)
+
+        until = step + self.TENURE
+        for edge_key in (key(a_id, b_id), key(c_id, d_id),
+                         key(a_id, c_id), key(b_id, d_id)):
+            tabu[edge_key] = until
+        if len(tabu) > 8 * self.TENURE:
+            self._tabu = {edge_key: until
+                          for edge_key, until in tabu.items()
+                          if until > step}
+
+        self._score = best_swap_score
+        return graph
+
+
+
 ########################################################################
 #
 # register concrete classes
@@ -405,6 +795,10 @@ class AbstractRandomlyReplacePercentageOfEdges(
 # To get an idea which enhancers work well/not so well/suit which phase
 # of the computation (i.e., far or close to lower bounds), see
 # ``notes.rst``.
+# When running with ``--adaptive``, the overall number of registrations
+# is the number of worker slots, which are then assigned to the
+# registered classes according to their recent success (i.e., no manual
+# re-configuration needed when the search enters another phase).
 
 # Experiment yourself, but those enhancers did not yield satisfying
 # progress in my cases:
@@ -432,3 +826,12 @@ class RandomlyReplaceFourEdges(AbstractRandomlyReplaceRandomEdges):
 class RandomlyReplaceEightEdges(AbstractRandomlyReplaceRandomEdges):
     """ See ``AbstractRandomlyReplaceRandomEdges``. """
     NUMBER_OF_EDGES_TO_REPLACE = 8
+
+Registry.register_multiple(1)(TabuSearch)
+
+@Registry.register_multiple(1)
+class RandomlyReplaceFourEdgesOfRemoteVertices(
+        AbstractRandomlyReplaceEdgesOfRemoteVertices
+):
+    """ See ``AbstractRandomlyReplaceEdgesOfRemoteVertices``. """
+    NUMBER_OF_EDGES_TO_REPLACE = 4
@@ -2,13 +2,36 @@
 All elements of a graph.
 """
 
-from logging import debug, warning
-from itertools import combinations
-from random import shuffle
-from collections import deque
-from statistics import median
+from logging import debug
+from random import shuffle, Random
+from array import array
+from zlib import compress, decompress
 
 from lib.hops_cache import HopsCache
+from lib import kernels
+from lib.lower_bounds import lower_bounds, aspl as total_distance_to_aspl
+
+FINGERPRINT_MODULUS = (1 << 61) - 1
+"""
+(Prime) modulus of the hashes of edges (see ``GolfGraph.fingerprint``).
+"""
+
+_vertex_keys = []
+
+
+def vertex_keys(order):
+    """
+    Returns a list of (at least) ``order`` random keys per vertex ID for
+    the hashes of edges (see ``GolfGraph.fingerprint``). The keys are
+    the same in all processes.
+    """
+    if len(_vertex_keys) < order:
+        # (re-)generated from the same seed, i.e., the existing keys stay
+        random = Random(0)
+        _vertex_keys[:] = [random.randrange(1, FINGERPRINT_MODULUS)
+                           for _ in range(order)]
+    return _vertex_keys
+
 
 class GraphPartitionedError(Exception):
     """
@@ -22,20 +45,18 @@ class Vertex(object):
     A vertex in a graph.
 
     We'll have a lot of those in memory, so store data wisely at the
-    instances.
+    instances: no ``__dict__`` (see ``__slots__``), and equality (and
+    the hash) is ``object``'s, i.e., identity. By our design, there are
+    no equal but non-identical vertices, and the built-in comparison is
+    way faster than any Python-level ``__eq__``.
     """
 
+    __slots__ = ("id", "edges_to", "edges_index")
+
     def __init__(self, id):
         self.id = id
 
-        self.breadcrumb = None
-        """
-        An attribute where non-recursive path finding algorithms can
-        store link to find their way back (i.e., to reconstruct the
-        path they went but didn't record).
-        """
-
-        self.edges_to = deque()
+        self.edges_to = []
         """
         The main data structure to represent edges.
         This list contains vertices this vertex has edges to.
@@ -43,31 +64,18 @@ class Vertex(object):
         vertices in ``edges_to`` (think: bidirectionally linked).
 
         Access patterns to this structure are different. Did some quick
-        tests. Lists appeared to perform almost 10% better than sets.
+        tests. Lists appeared to perform almost 10% better than sets
+        for iterating. For member checks and removals, see
+        ``edges_index``.
         """
 
-    __hash__ = object.__hash__
-    """
-    We explicitly re-use ``object``'s ``__hash__`` here, since it is
-    faster than providing an own ``id()``-based implementation.
-    See also:
-    https://docs.python.org/3/reference/datamodel.html#object.__hash__
-
-    Also, if we'd base our hypothetical implementation of ``__hash__``
-    on ``self.id`` (what would make sense), we'd have to do some stunts
-    to make an instance of ``Vertex`` to work with pickle
-    (see `here <https://bugs.python.org/issue1761028>`__).
-    """
-
-    def __eq__(self, other):
+        self.edges_index = {}
         """
-        Returns whether ``self`` and ``other`` have the same ID
-        (which, by our design, implies that the objects are identical).
-        Called very very often, avoid adding logic.
+        Maps the vertices in ``edges_to`` to their position therein.
+        Allows for member checks and removals (by swapping with the last
+        item of ``edges_to``) in constant time, i.e., independent of the
+        degree. Use this for member checks instead of ``edges_to``.
         """
-        assert (self.id == other.id) == (id(self) == id(other)), \
-               "we don't expect to have equal but non-identical vertices!?"
-        return self.id == other.id
 
     def __lt__(self, other):
         """
@@ -101,6 +109,20 @@ class GolfGraph(object):
     ``order`` and ``degree`` of at least two.
     """
 
+    PICKLE_COMPRESSION_LEVEL = 1
+    """
+    ``zlib`` compression level for the edges (and distances) of pickled
+    graphs (0 disables compression).
+    """
+
+    PICKLE_DISTANCES = False
+    """
+    Whether pickled graphs contain the distances between all vertices
+    (if cached completely, see ``HopsCache.tobytes()``), which spares
+    the unpickling process to search them again, at the cost of O(n^2)
+    instead of O(n*d) bytes. See also ``__getstate__()``.
+    """
+
     def __init__(self, order, degree):
         debug("initializing graph")
 
@@ -110,17 +132,25 @@ class GolfGraph(object):
         self._order = order
         self._degree = degree
 
-        self._aspl_lower_bound = None
-        self._diameter_lower_bound = None
-
         # to be filled by ``self.analyze()``
         # note on performance: making the below lazy (even just the
         # probably less used mspl) actually lowers the performance
         self.diameter = None
-        self.aspl = None
+        # sum of the shortest path lengths between all ordered pairs of
+        # vertices (integer, hence suitable for exact comparisons; the
+        # average shortest path length is derived from it for display):
+        self.total_distance = None
+        # number of ordered pairs of vertices per shortest path length
+        # (index), i.e., ``distance_counts[diameter]`` is the number of
+        # pairs at maximum distance:
+        self.distance_counts = None
         # median shortest path length (used internally as an additional
         # quality metric):
         self.mspl = None
+        # maximum distance to any other vertex per vertex ID:
+        self.eccentricities = None
+        # sum of the distances to all other vertices per vertex ID:
+        self.distance_sums = None
 
         # If edges modified and vertices' hops caches need to be updated.
         # Although it might look a bit funny to initialize ``self`` dirty,
@@ -131,7 +161,23 @@ class GolfGraph(object):
         # Tests showed, that using tuples here is a tiny bit slower.
         self.vertices = [Vertex(i) for i in range(order)]
 
-        self.hops_cache = HopsCache(order)
+        self.hops_cache = HopsCache(self.vertices)
+
+        # bridges (see ``bridges()``), ``None`` if edges modified since
+        # computed last
+        self._bridges = None
+
+        # the edges as represented by the kernels (see ``adjacency()``),
+        # ``None`` if edges modified since computed last
+        self._adjacency = None
+
+        # Zobrist-style hash of the edges, i.e., the "xor" of the hashes
+        # of all edges (the product of the keys of their vertices modulo
+        # ``FINGERPRINT_MODULUS``), maintained by adding and removing
+        # edges; equal graphs have equal fingerprints (but not vice
+        # versa, although unlikely):
+        self.fingerprint = 0
+        self._vertex_keys = vertex_keys(order)
 
     def __str__(self):
         bits = [
@@ -141,6 +187,24 @@ class GolfGraph(object):
         ]
         return " ".join(bits)
 
+    @property
+    def aspl(self):
+        """
+        Returns the average shortest path length (derived from
+        ``total_distance``, please use the latter for comparisons).
+        """
+        if self.total_distance is None:
+            return None
+        return total_distance_to_aspl(self.total_distance, self._order)
+
+    @property
+    def diameter_pairs(self):
+        """
+        Returns the number of ordered pairs of vertices at maximum
+        distance.
+        """
+        return self.distance_counts[self.diameter]
+
     @property
     def order(self):
         """
@@ -157,72 +221,29 @@ class GolfGraph(object):
         """
         return self._degree
 
-    def _calculate_lower_bounds(self):
+    @property
+    def aspl_lower_bound(self):
         """
-        Returns the lower bound of the (diameter, average shortest path
-        length) for the given ``order`` and ``degree``.
-
-        Copied from http://research.nii.ac.jp/graphgolf/py/create-random.py
+        Returns the lower bound for the average shortest path length for
+        this graph (for display, see ``total_distance_lower_bound``).
         """
-
-        assert self._aspl_lower_bound is None and \
-               self._diameter_lower_bound is None, \
-               "lower bounds already calculated"
-
-        order = self._order
-        degree = self._degree
-
-        if order < 2:
-            warning("could not calculate lower bound for order %i"
-                    " (not implemented for order<2)", order)
-            return None, None
-
-        if degree < 2:
-            warning("could not calculate lower bound for degree %i"
-                    " (not implemented for degree<2)", degree)
-            return None, None
-
-        diameter = -1
-        aspl = 0.0
-        n = 1
-        r = 1
-        while True:
-            tmp = n + degree * pow(degree - 1, r - 1)
-            if tmp >= order:
-                break
-            n = tmp
-            aspl += r * degree * pow(degree - 1, r - 1)
-            diameter = r
-            r += 1
-        diameter += 1
-        aspl += diameter * (order - n)
-        aspl /= (order - 1)
-
-        self._aspl_lower_bound = aspl
-        self._diameter_lower_bound = diameter
+        return total_distance_to_aspl(self.total_distance_lower_bound,
+                                      self._order)
 
     @property
-    def aspl_lower_bound(self):
+    def total_distance_lower_bound(self):
         """
-        Returns the lower bound for the average shortest path length for
-        this graph.
-        Be aware, that for low values of ``order`` and ``degree``, this
-        might return ``None``, due to a lack of implementation.
+        Returns the lower bound for the total distance (see attribute
+        ``total_distance``) for this graph.
         """
-        if self._aspl_lower_bound is None:
-            self._calculate_lower_bounds()
-        return self._aspl_lower_bound
+        return lower_bounds(self._order, self._degree)[1]
 
     @property
     def diameter_lower_bound(self):
         """
         Returns the lower bound for the diameter for this graph.
-        Be aware, that for low values of ``order`` and ``degree``, this
-        might return ``None``, due to a lack of implementation.
         """
-        if self._diameter_lower_bound is None:
-            self._calculate_lower_bounds()
-        return self._diameter_lower_bound
+        return lower_bounds(self._order, self._degree)[0]
 
     def add_edge_unsafe(self, vertex_a, vertex_b):
         """
@@ -234,9 +255,17 @@ class GolfGraph(object):
         assert vertex_a in self.vertices
         assert vertex_b in self.vertices
         assert vertex_a != vertex_b
+        assert vertex_b not in vertex_a.edges_index
+        vertex_a.edges_index[vertex_b] = len(vertex_a.edges_to)
         vertex_a.edges_to.append(vertex_b)
+        vertex_b.edges_index[vertex_a] = len(vertex_b.edges_to)
         vertex_b.edges_to.append(vertex_a)
+        keys = self._vertex_keys
+        self.fingerprint ^= (keys[vertex_a.id] * keys[vertex_b.id] %
+                             FINGERPRINT_MODULUS)
         self._dirty = True
+        self._bridges = None
+        self._adjacency = None
         assert len(vertex_a.edges_to) <= self.degree
         assert len(vertex_b.edges_to) <= self.degree
 
@@ -250,9 +279,29 @@ class GolfGraph(object):
         assert vertex_a in self.vertices
         assert vertex_b in self.vertices
         assert vertex_a != vertex_b, "vertex should not have edge to itself"
-        vertex_a.edges_to.remove(vertex_b)
-        vertex_b.edges_to.remove(vertex_a)
+        self._remove_edge_to(vertex_a, vertex_b)
+        self._remove_edge_to(vertex_b, vertex_a)
+        keys = self._vertex_keys
+        self.fingerprint ^= (keys[vertex_a.id] * keys[vertex_b.id] %
+                             FINGERPRINT_MODULUS)
         self._dirty = True
+        self._bridges = None
+        self._adjacency = None
+
+    @staticmethod
+    def _remove_edge_to(vertex_a, vertex_b):
+        """
+        Removes ``vertex_b`` from the edges of ``vertex_a`` in constant
+        time, by moving the last of ``vertex_a``'s edges to the freed
+        position.
+        """
+        edges_to = vertex_a.edges_to
+        edges_index = vertex_a.edges_index
+        position = edges_index.pop(vertex_b)
+        last = edges_to.pop()
+        if last is not vertex_b:
+            edges_to[position] = last
+            edges_index[last] = position
 
     def add_as_many_random_edges_as_possible(self, limit_to_vertices=None):
         """
@@ -331,7 +380,7 @@ class GolfGraph(object):
                     assert len(vertex_b.edges_to) < degree
 
                     # do not add edges_to that already exist
-                    if vertex_b in vertex_a.edges_to:
+                    if vertex_b in vertex_a.edges_index:
                         assert None is debug(
                             "vertex b (%s) already connected", vertex_b
                         )
@@ -355,12 +404,9 @@ class GolfGraph(object):
         because they are skipped when running the interpreter with -O.
         Design your calling code to not call this with invalid input.
 
-        It actually searches the paths always from the lower ID to the
-        higher ID vertex to have more hits in the hops caches.
-        (We could also fill caches for the reverse direction as well but
-        this feels way more complicated)
-
-        Called very often, keep "efficient".
+        The path is reconstructed from the distances from either vertex
+        (see ``HopsCache``). If you need the length only,
+        please use ``hops_count``.
         """
         assert None is debug("searching shortest path between %s and %s",
                              vertex_a, vertex_b)
@@ -372,83 +418,159 @@ class GolfGraph(object):
                "won't search hops between a vertex and itself..."
 
         # check if we can serve the request from the cache
-        cached_hops = self.hops_cache.get(vertex_a, vertex_b)
-        if cached_hops is not None:
-            assert None is debug("hops cache hit")
-            return cached_hops
-
-        # ``list`` because this must be ordered
-        # (to not descend accidentally while doing breadth-first search):
-        currently_enqueued = deque((vertex_a,))
-
-        # out special hacky semantic to mark the start vertex
-        # (saves a comparison in the inner-most loop)
-        vertex_a.breadcrumb = vertex_a
-
-        # non-recursive breadth-first walk the graph and lay breadcrumbs
-        # until the desired vertex is found
-        currently_visiting = None
-        while currently_enqueued:
-            currently_visiting = currently_enqueued.popleft()
-
-            # check if we arrived at the target vertex
-            if currently_visiting == vertex_b:
-                break
+        hops = self.hops_cache.get(vertex_a, vertex_b)
+        if hops is None:
+            self._breadth_first_search(vertex_a)
+            hops = self.hops_cache.get(vertex_a, vertex_b)
 
-            # note on the hops cache: sadly, we cannot use the hops cache
-            # here, since we could never know if another enqueued vertex
-            # might have a shorter connection to ``vertex_b``.
-
-            # enqueue connected vertices
-            for edge_to in currently_visiting.edges_to:
-                if edge_to.breadcrumb is None:
-                    assert edge_to != vertex_a, \
-                           "should never come across start node"
-                    edge_to.breadcrumb = currently_visiting
-                    currently_enqueued.append(edge_to)
-        else:
+        assert vertex_a not in hops and vertex_b not in hops, \
+               "neither start nor destination node should be returned"
+
+        return hops
+
+    def _breadth_first_search(self, source, counts=None):
+        """
+        Walks the whole graph breadth-first from ``source`` and caches the
+        distances in the hops cache (see ``lib.kernels`` for ``counts``).
+        Returns a tuple of the distances, the eccentricity and the sum
+        of the distances of ``source``.
+        Raises ``GraphPartitionedError`` if not all vertices could be
+        reached.
+
+        Called very often, keep "efficient".
+        """
+        assert None is debug("breadth-first search from %s", source)
+
+        source_id = source.id
+        distances = self.hops_cache.new_row()
+        reached, eccentricity, distance_sum = kernels.breadth_first_search(
+            self.adjacency(), source_id, distances, counts
+        )
+        if reached < self._order:
             raise GraphPartitionedError()
 
-        # follow back the breadcrumbs and remember the hops taken
-        # (excluding departure and destination)
-        # note: probably because we copy this list to the vertices we
-        # visit, using lists here is slightly faster than, e.g., a deque
-        hops = []
+        self.hops_cache.set(source_id, distances)
+        return distances, eccentricity, distance_sum
+
+    def adjacency(self):
+        """
+        Returns the edges as represented by the kernels (see
+        ``lib.kernels``), computed once per modification of the edges.
+        Do not modify.
+
+        The innermost loops of breadth-first searches are faster on
+        integers than on the attributes of vertices.
+        """
+        if self._adjacency is None:
+            self._adjacency = kernels.adjacency([
+                [edge_to.id for edge_to in vertex.edges_to]
+                for vertex in self.vertices
+            ])
+        return self._adjacency
 
-        # skip the target vertex (should not appear in returned hops list)
-        currently_visiting = currently_visiting.breadcrumb
+    def connected(self):
+        """
+        Returns whether all vertices can be reached from the first one.
 
-        # loop until we arrive at the start vertex (and skip it as well)
-        while True:
+        This is just one breadth-first search w/o recording anything,
+        i.e., cheap compared to ``analyze()``. Works on dirty graphs.
+        """
+        distances = array("l", [-1]) * self._order
+        reached = kernels.breadth_first_search(self.adjacency(), 0,
+                                               distances)[0]
+        return reached == self._order
 
-            # fill the hops cache:
-            if self.hops_cache.get(currently_visiting, vertex_b) is None:
-                self.hops_cache.set(currently_visiting, vertex_b, tuple(hops))
+    def distances_from(self, source):
+        """
+        Returns an array with the distance from ``source`` to every
+        vertex (-1 if unreachable).
 
-            # break the loop if we would re-visit the current vertex
-            # (also, skip adding it to ``hops``)
-            if currently_visiting == vertex_a:
-                assert currently_visiting == currently_visiting.breadcrumb
-                break
+        Like ``_breadth_first_search`` but w/o caching, hence, works on
+        dirty graphs.
+        """
+        distances = array("l", [-1]) * self._order
+        kernels.breadth_first_search(self.adjacency(), source.id, distances)
+        return distances
 
-            # remember this vertex as hop
-            hops.insert(0, currently_visiting)
+    def bridges(self):
+        """
+        Returns the set of bridges, i.e., edges whose removal would
+        partition the graph, as tuples of (lower ID, higher ID).
 
-            # move on (i.e., continue to follow the breadcrumbs back)
-            currently_visiting = currently_visiting.breadcrumb
+        Computed in linear time when edges were modified since the last
+        call, served from memory otherwise. Works on dirty graphs.
+        """
+        if self._bridges is None:
+            self._bridges = self._find_bridges()
+        return self._bridges
 
-        assert vertex_a not in hops and vertex_b not in hops, \
-               "neither start nor destination node should be returned"
+    def is_bridge(self, vertex_a, vertex_b):
+        """
+        Returns whether the edge between ``vertex_a`` and ``vertex_b`` is
+        a bridge (see ``bridges()``).
+        """
+        if vertex_a.id < vertex_b.id:
+            return (vertex_a.id, vertex_b.id) in self.bridges()
+        return (vertex_b.id, vertex_a.id) in self.bridges()
 
-        # vacuum breadcrumbs
-        #   note: we could also re-walk the vertices we touched (by
-        #   looking at the breadcrumbs) and reset the breadcrumbs only
-        #   for those vertices. However, blindly resetting the breadcrumbs
-        #   of all vertices proved to be significantly faster. Really.
-        for vertex in self.vertices:
-            vertex.breadcrumb = None
+    def _find_bridges(self):
+        """
+        Returns the set of bridges (see ``bridges()``).
 
-        return tuple(hops)
+        Tarjan's algorithm: an edge from a vertex to its child in the
+        depth-first search tree is a bridge, if no vertex in the child's
+        subtree has an edge back to the vertex or its ancestors. The
+        search is non-recursive, to not exceed the recursion limit on
+        bigger graphs.
+        """
+        order = self._order
+        # order of discovery per vertex ID (-1 for not yet discovered)
+        discovered = array("l", [-1]) * order
+        # lowest order of discovery reachable from the vertex' subtree
+        # with at most one edge not in the search tree
+        lowest = array("l", [0]) * order
+        bridges = set()
+        counter = 0
+
+        for root in self.vertices:
+            if discovered[root.id] >= 0:
+                continue
+            discovered[root.id] = lowest[root.id] = counter
+            counter += 1
+
+            # tuples of (vertex, parent, iterator over remaining edges)
+            stack = [(root, None, iter(root.edges_to))]
+            while stack:
+                vertex, parent, edges_to = stack[-1]
+                vertex_id = vertex.id
+                for edge_to in edges_to:
+                    # no parallel edges, so skipping the parent is safe
+                    if edge_to is parent:
+                        continue
+                    edge_to_id = edge_to.id
+                    if discovered[edge_to_id] < 0:
+                        discovered[edge_to_id] = lowest[edge_to_id] = counter
+                        counter += 1
+                        stack.append((edge_to, vertex,
+                                      iter(edge_to.edges_to)))
+                        break
+                    if discovered[edge_to_id] < lowest[vertex_id]:
+                        lowest[vertex_id] = discovered[edge_to_id]
+                else:
+                    # all edges of ``vertex`` processed
+                    stack.pop()
+                    if parent is None:
+                        continue
+                    parent_id = parent.id
+                    if lowest[vertex_id] < lowest[parent_id]:
+                        lowest[parent_id] = lowest[vertex_id]
+                    if lowest[vertex_id] > discovered[parent_id]:
+                        if parent_id < vertex_id:
+                            bridges.add((parent_id, vertex_id))
+                        else:
+                            bridges.add((vertex_id, parent_id))
+
+        return bridges
 
     def hops_count(self, vertex_a, vertex_b):
         """
@@ -457,23 +579,29 @@ class GolfGraph(object):
         Raises ``GraphPartitionedError`` if no path between ``vertex_a``
         and ``vertex_b`` could be found.
         """
-        return len(self.hops(vertex_a, vertex_b)) + 1
+        assert not self._dirty
+        distance = self.hops_cache.distance(vertex_a, vertex_b)
+        if distance is None:
+            distance = self._breadth_first_search(vertex_a)[0][vertex_b.id]
+        return distance
 
-    def analyze(self):
+    def analyze(self, diameter_limit=None, sources=()):
         """
-        Sets instance attributes ``aspl`` and ``diameter``.
+        Sets instance attributes ``total_distance``, ``distance_counts``,
+        ``diameter``, ``mspl``, ``eccentricities`` and ``distance_sums``.
 
         For an unconnected graph, we return all zeros or -
         if not running in optimized mode - raise an ``AssertionError``.
         Due to this obscure logic, it is not recommended to call this on
         unconnected graphs.
 
-        The implementations searches just one direction per
-        combination of vertices to avoid searching the way back as well:
-        (a + a_reverse + b + b_reverse + ...) / [count] ==
-        (2*a + 2*b + ...) / 2[count] ==
-        2 * (a + b + ...) / 2[count] ==
-        (a + b + ...) / [count]
+        The implementation searches breadth-first once from every vertex
+        (filling the hops cache for all pairs of vertices on the way),
+        starting with ``sources``.
+        If a diameter greater than ``diameter_limit`` is found, we stop
+        early and return ``False`` (the graph stays dirty). Hence, pass
+        the vertices likely to have the greatest eccentricities as
+        ``sources``. Returns ``True`` otherwise.
         """
         assert None is debug("analyzing graph")
 
@@ -484,26 +612,103 @@ class GolfGraph(object):
         self.hops_cache.clear()
         self._dirty = False
 
-        shortest_path_lengths = tuple(
-            self.hops_count(vertex_a, vertex_b)
-            for vertex_a, vertex_b in combinations(self.vertices, 2)
-        )
+        vertices = self.vertices
+        if sources:
+            ordered = bytearray(self._order)
+            for vertex in sources:
+                ordered[vertex.id] = 1
+            vertices = list(sources)
+            vertices.extend(v for v in self.vertices if not ordered[v.id])
+
+        # count the shortest path lengths, index is the length
+        # (to avoid iterating over the path lengths several times - to
+        # find the maximum, to compute the sum, to find the median)
+        counts = array("q", [0]) * self._order
+        eccentricities = array(self.hops_cache.distances_typecode,
+                               [0]) * self._order
+        distance_sums = array("q", [0]) * self._order
+        breadth_first_search = self._breadth_first_search
+        diameter = 0
+        for vertex in vertices:
+            _, eccentricity, distance_sum = breadth_first_search(vertex,
+                                                                 counts)
+            eccentricities[vertex.id] = eccentricity
+            distance_sums[vertex.id] = distance_sum
+            if eccentricity > diameter:
+                diameter = eccentricity
+                if diameter_limit is not None and diameter > diameter_limit:
+                    assert None is debug("diameter limit exceeded")
+                    self.hops_cache.clear()
+                    self._dirty = True
+                    return False
+        self._set_analysis(counts[:diameter + 1].tolist(), eccentricities,
+                           distance_sums)
+        return True
+
+    def analysis(self):
+        """
+        Returns a tuple of the analysis results the others are derived
+        from (``distance_counts``, ``eccentricities`` and
+        ``distance_sums``), e.g., to report them w/o the graph. See also
+        ``restore_analysis()``.
+        """
+        assert not self._dirty
+        return (self.distance_counts, self.eccentricities,
+                self.distance_sums)
+
+    def restore_analysis(self, analysis):
+        """
+        Sets the ``analysis`` (see ``analysis()``) of an equal graph,
+        instead of analyzing this graph again. The hops cache is refilled
+        lazily by ``hops()``.
+        """
+        assert self._dirty, "already analyzed"
+        self.hops_cache.clear()
+        self._dirty = False
+        self._set_analysis(*analysis)
 
-        # to avoid iterating over the path lengths twice - once to find
-        # the maximum, another time to compute the average - we calculate
-        # by hand in the following loop
-        longest_shortest_path = -1
-        lengths_sum = 0
-        lengths_count = 0
-        for length in shortest_path_lengths:
-            lengths_sum += length
-            lengths_count += 1
-            if length > longest_shortest_path:
-                longest_shortest_path = length
-
-        self.aspl = lengths_sum/lengths_count
-        self.diameter = longest_shortest_path
-        self.mspl = median(shortest_path_lengths)
+    def _set_analysis(self, counts, eccentricities, distance_sums):
+        """
+        Sets the analysis results, see ``analyze()``.
+        """
+        self.eccentricities = eccentricities
+        self.distance_sums = distance_sums
+        self.distance_counts = counts
+        self.diameter = len(counts) - 1
+        self.total_distance = sum(length * count
+                                  for length, count in enumerate(counts))
+        self.mspl = self._median(counts)
+
+    def peripheral_vertices(self):
+        """
+        Returns the vertices whose eccentricity equals the diameter.
+        """
+        assert not self._dirty
+        diameter = self.diameter
+        eccentricities = self.eccentricities
+        return [vertex for vertex in self.vertices
+                if eccentricities[vertex.id] == diameter]
+
+    @staticmethod
+    def _median(counts):
+        """
+        Returns the median of the shortest path lengths (of unordered
+        pairs of vertices) given their ``counts`` for ordered pairs.
+        Same semantics as ``statistics.median``.
+        """
+        pairs = sum(counts) // 2
+        middle = pairs // 2
+        lower = None
+        seen = 0
+        for length, count in enumerate(counts):
+            seen += count // 2
+            if lower is None and seen > middle - 1 and pairs % 2 == 0:
+                lower = length
+            if seen > middle:
+                if pairs % 2:
+                    return length
+                return (lower + length) / 2
+        raise ValueError("no lengths counted")
 
     def edges(self):
         """
@@ -518,6 +723,55 @@ class GolfGraph(object):
                     edges.add((vertex_b, vertex_a))
         return edges
 
+    def edge_ids(self):
+        """
+        Returns the edges as flat ``array`` of vertex IDs
+        (i.e., ``[a0, b0, a1, b1, ...]``).
+
+        This is a compact representation, e.g., to send graphs to other
+        processes. See also ``from_edge_ids()``.
+        """
+        ids = array("H" if self._order <= 0xFFFF else "L")
+        for vertex_a in self.vertices:
+            vertex_a_id = vertex_a.id
+            for vertex_b in vertex_a.edges_to:
+                if vertex_a_id < vertex_b.id:
+                    ids.append(vertex_a_id)
+                    ids.append(vertex_b.id)
+        return ids
+
+    @classmethod
+    def from_edge_ids(cls, order, degree, edge_ids):
+        """
+        Returns a new (not yet analyzed) graph with the edges of a
+        previous return value of ``edge_ids()``.
+        """
+        graph = cls(order, degree)
+        graph.add_edge_ids_unsafe(edge_ids)
+        return graph
+
+    def add_edge_ids_unsafe(self, edge_ids):
+        """
+        Adds the edges ``edge_ids`` (flat array of vertex IDs, see
+        ``edge_ids()``) w/o checking constraints (see
+        ``lib.validation``).
+        """
+        vertices = self.vertices
+        add_edge_unsafe = self.add_edge_unsafe
+        ids = iter(edge_ids)
+        for vertex_a_id, vertex_b_id in zip(ids, ids):
+            add_edge_unsafe(vertices[vertex_a_id], vertices[vertex_b_id])
+
+    def edge_delta(self, other):
+        """
+        Returns a tuple of (removed, added) edges, which turn this graph
+        into ``other``. Edges are tuples of (ordered) vertex IDs.
+        """
+        own_edges = set((a.id, b.id) for a, b in self.edges())
+        other_edges = set((a.id, b.id) for a, b in other.edges())
+        return (tuple(own_edges - other_edges),
+                tuple(other_edges - own_edges))
+
     def duplicate(self):
         """
         Returns a (deep) duplicate of this graph.
@@ -538,12 +792,15 @@ class GolfGraph(object):
             )
 
         # copy over shortest path caches
-        dup.hops_cache.set_from_ids(self.hops_cache.ids(), dup.vertices)
+        dup.hops_cache = self.hops_cache.duplicate(dup.vertices)
 
         # copy analysis data
         dup.diameter = self.diameter
-        dup.aspl = self.aspl
+        dup.total_distance = self.total_distance
+        dup.distance_counts = self.distance_counts
         dup.mspl = self.mspl
+        dup.eccentricities = self.eccentricities
+        dup.distance_sums = self.distance_sums
         dup._dirty = self._dirty
 
         return dup
@@ -559,9 +816,9 @@ class GolfGraph(object):
             return False
         assert self.diameter == self.diameter_lower_bound
 
-        if self.aspl > self.aspl_lower_bound:
+        if self.total_distance > self.total_distance_lower_bound:
             return False
-        assert self.aspl == self.aspl_lower_bound
+        assert self.total_distance == self.total_distance_lower_bound
 
         return True
 
@@ -578,12 +835,26 @@ class GolfGraph(object):
         """
         assert not self._dirty
         assert not other._dirty
-        if self.mspl < other.mspl:
-            return True
-        if self.aspl < other.aspl:
-            return True
-        if self.diameter < other.diameter:
-            return True
+        return self.better(self.metrics(), other.metrics())
+
+    def metrics(self):
+        """
+        Returns a tuple of the quality metrics (``mspl``,
+        ``total_distance`` and ``diameter``), e.g., to report them w/o
+        the graph. See also ``better()``.
+        """
+        assert not self._dirty
+        return (self.mspl, self.total_distance, self.diameter)
+
+    @staticmethod
+    def better(metrics, other_metrics):
+        """
+        Returns ``True`` if ``metrics`` (see ``metrics()``) are better
+        than ``other_metrics``, in the sense of ``__lt__``.
+        """
+        for value, other_value in zip(metrics, other_metrics):
+            if value < other_value:
+                return True
         return False
 
     def __getstate__(self):
@@ -592,27 +863,39 @@ class GolfGraph(object):
         ``pickle``'s default implementation exceeds the maximum recursion
         depths very soon for bigger graphs.
 
-        Test show, that this implementation is at least fast as the
-        generic implementation by the ``pickle`` module.
+        We pickle only the edges (as packed array of IDs, see
+        ``edge_ids()``) and the scalar analysis results, i.e., O(n*d)
+        instead of O(n^2) for the hops cache. The hops cache is
+        refilled lazily by ``hops()`` after unpickling, unless shipped
+        along (see ``PICKLE_DISTANCES``).
         """
         debug("collecting state of graph instance")
 
-        # We do not want to transform the iterable of modified vertices to
-        # an iterable of IDs. After invalidating the corresponding caches,
-        # this iterable will be empty.
         assert not self._dirty, \
                "please analyze the graph before pickling it"
 
-        debug("collecting all attributes but vertices")
+        debug("collecting all attributes but vertices and caches")
         state = {k: v
                  for k, v in self.__dict__.items()
-                 if k != "vertices"}
-
-        debug("collecting edge IDs")
-        state["edges"] = tuple((a.id, b.id) for a, b in self.edges())
-
-        debug("collecting hops caches of vertices")
-        state["hops_cache"] = self.hops_cache.ids()
+                 if k not in ("vertices", "hops_cache", "_bridges",
+                              "_adjacency", "_vertex_keys")}
+
+        debug("packing edge IDs")
+        edge_ids = self.edge_ids()
+        state["edge_ids_typecode"] = edge_ids.typecode
+        edge_ids = edge_ids.tobytes()
+        state["edge_ids_compressed"] = bool(self.PICKLE_COMPRESSION_LEVEL)
+        if self.PICKLE_COMPRESSION_LEVEL:
+            edge_ids = compress(edge_ids, self.PICKLE_COMPRESSION_LEVEL)
+        state["edge_ids"] = edge_ids
+
+        if self.PICKLE_DISTANCES and self.hops_cache.complete():
+            debug("packing distances")
+            distances = self.hops_cache.tobytes()
+            if self.PICKLE_COMPRESSION_LEVEL:
+                distances = compress(distances,
+                                     self.PICKLE_COMPRESSION_LEVEL)
+            state["distances"] = distances
 
         return state
 
@@ -628,16 +911,29 @@ class GolfGraph(object):
         self._degree = state.pop("_degree")
 
         debug("restoring vertices")
-        self.vertices = tuple(Vertex(i) for i in range(self.order))
+        self.vertices = [Vertex(i) for i in range(self.order)]
         vertices = self.vertices
 
         debug("restoring edges")
-        for src_id, dest_id in state.pop("edges"):
-            self.add_edge_unsafe(vertices[src_id], vertices[dest_id])
+        self._bridges = None
+        self._adjacency = None
+        self.fingerprint = 0
+        self._vertex_keys = vertex_keys(self.order)
+        edge_ids = state.pop("edge_ids")
+        compressed = state.pop("edge_ids_compressed")
+        if compressed:
+            edge_ids = decompress(edge_ids)
+        self.add_edge_ids_unsafe(
+            array(state.pop("edge_ids_typecode"), edge_ids)
+        )
 
-        debug("restoring hops caches")
-        self.hops_cache = HopsCache(self._order)
-        self.hops_cache.set_from_ids(state.pop("hops_cache"), vertices)
+        debug("initializing hops caches")
+        self.hops_cache = HopsCache(vertices)
+        distances = state.pop("distances", None)
+        if distances is not None:
+            if compressed:
+                distances = decompress(distances)
+            self.hops_cache.frombytes(distances)
 
         debug("restoring remaining attributes")
         for key, value in state.items():
@@ -1,127 +1,164 @@
 """
-See docstring of class ``HopsCace``.
+See docstring of class ``HopsCache``.
 """
 
+from array import array
+
 class HopsCache(object):
     """
     A (for our use case) specialized data structure to store hops
     between vertices.
 
-    The idea is to store the hops always in the same direction (vertex
-    with lower ID to vertex with higher ID) for optimization.
+    Instead of storing every path, we store one row of distances per
+    source vertex, as compact arrays of integers. Paths are
+    reconstructed from the distances only when asked for, by walking to
+    a neighbour one step closer to the source, repeatedly (hence, the
+    rows are valid only as long as the edges are not modified).
+
+    Rows are never modified once set (see ``set()`` and ``clear()``),
+    so duplicates share them, and they can be shipped as they are (see
+    ``tobytes()``).
 
     It tries to be fast.
     """
 
-    def __init__(self, order):
+    def __init__(self, vertices):
         """
-        ``order`` is the order of the graph, which we need for
-        pre-allocation.
+        ``vertices`` are the vertices of the graph (ordered by ID), which
+        we need to reconstruct paths.
         """
+        self.vertices = vertices
+
+        order = len(vertices)
 
-        self._data = [
-            [None] * cache_size
-            for cache_size in range(order-1, 0, -1)
-        ]
+        self.distances_typecode = "h" if order <= 0x7FFF else "l"
         """
-        Since we store the hops from the lower to the higher vertex ID,
-        the first vertex, has a maximum of ``order-1`` cache entries,
-        the second one ``order-2`` and so on.
+        Type code for arrays of distances (must be signed, since we use
+        -1 for "unknown").
         """
 
-    def get(self, vertex_a, vertex_b):
+        self._distances = [None] * order
         """
-        Returns hops cache entry between ``vertex_a`` and ``vertex_b``
-        or ``None``.
+        Per source vertex ID: ``None`` or an array with the distance to
+        every vertex.
         """
-        assert vertex_a != vertex_b
-        if vertex_a < vertex_b:
-            return self._data[vertex_a.id][vertex_b.id - vertex_a.id - 1]
-        else:
-            hops = self._data[vertex_b.id][vertex_a.id - vertex_b.id - 1]
-            if hops is None:
-                return None
-            return tuple(reversed(hops))
 
-    def set(self, vertex_a, vertex_b, hops):
+    def has(self, source_id):
         """
-        Sets hops cache entry between ``vertex_a`` and ``vertex_b``.
+        Returns whether a row for the vertex ``source_id`` is cached.
         """
-        assert vertex_a != vertex_b
-        if vertex_a < vertex_b:
-            assert self._data[vertex_a.id][vertex_b.id - vertex_a.id - 1] \
-                   is None, \
-                   "please check why you overwrite this cache entry " \
-                   "and clear it manually before, if this is really what " \
-                   "you want to do (we usually do not need this)"
-            self._data[vertex_a.id][vertex_b.id - vertex_a.id - 1] = hops
-        else:
-            assert self._data[vertex_b.id][vertex_a.id - vertex_b.id - 1] \
-                   is None, \
-                   "please check why you overwrite this cache entry " \
-                   "and clear it manually before, if this is really what " \
-                   "you want to do (we usually do not need this)"
-            self._data[vertex_b.id][vertex_a.id - vertex_b.id - 1] = tuple(
-                reversed(hops)
-            )
-
-    def unset(self, vertex_a, vertex_b):
-        """
-        Removes cache entry for hops between ``vertex_a`` and
-        ``vertex_b``.
+        return self._distances[source_id] is not None
+
+    def complete(self):
+        """
+        Returns whether the rows for all vertices are cached.
+        """
+        return None not in self._distances
+
+    def set(self, source_id, distances):
+        """
+        Sets the row of distances for the vertex ``source_id``.
+        """
+        assert self._distances[source_id] is None, \
+               "please check why you overwrite this cache entry " \
+               "and clear it manually before, if this is really what " \
+               "you want to do (we usually do not need this)"
+        self._distances[source_id] = distances
+
+    def distance(self, vertex_a, vertex_b):
+        """
+        Returns the distance between ``vertex_a`` and ``vertex_b`` or
+        ``None``, if not cached.
+        """
+        distances = self._distances[vertex_a.id]
+        if distances is not None:
+            return distances[vertex_b.id]
+        distances = self._distances[vertex_b.id]
+        if distances is not None:
+            return distances[vertex_a.id]
+        return None
+
+    def distances(self, source_id):
+        """
+        Returns the row of distances for the vertex ``source_id`` or
+        ``None``, if not cached.
+        """
+        return self._distances[source_id]
+
+    def get(self, vertex_a, vertex_b):
+        """
+        Returns hops between ``vertex_a`` and ``vertex_b`` (excluding
+        both) or ``None``, if not cached.
         """
         assert vertex_a != vertex_b
-        if vertex_b < vertex_a:
-            vertex_a, vertex_b = vertex_b, vertex_a
 
-        assert self._data[vertex_a.id][vertex_b.id - vertex_a.id - 1] \
-               is not None, \
-                   "please check why you double-unset this cache entry " \
-                   "and clear it manually before, if this is really what " \
-                   "you want to do (we usually do not need this)"
-        self._data[vertex_a.id][vertex_b.id - vertex_a.id - 1] = None
+        # walk from ``vertex_a`` to ``vertex_b`` (forward)
+        distances = self._distances[vertex_b.id]
+        if distances is not None:
+            return tuple(self._walk(vertex_a, distances))
+
+        # walk from ``vertex_b`` to ``vertex_a`` (backwards)
+        distances = self._distances[vertex_a.id]
+        if distances is not None:
+            hops = self._walk(vertex_b, distances)
+            hops.reverse()
+            return tuple(hops)
+
+        return None
+
+    @staticmethod
+    def _walk(vertex, distances):
+        """
+        Returns a list of the vertices on a shortest path from ``vertex``
+        to the source of the row ``distances`` (excluding both).
+        """
+        hops = []
+        distance = distances[vertex.id] - 1
+        while distance:
+            for edge_to in vertex.edges_to:
+                if distances[edge_to.id] == distance:
+                    vertex = edge_to
+                    break
+            hops.append(vertex)
+            distance -= 1
+        return hops
 
     def clear(self):
         """ Drops all cache entries. """
-        for entries in self._data:
-            for entry_i, _ in enumerate(entries):
-                entries[entry_i] = None
-
-    def ids(self):
-        """
-        Returns an iterators for all cached values in the style of:
-        (
-            ( # from vertex 0
-                (hop, hop, ...), # to vertex 1
-                (hop, hop, ...), # to vertex 2
-                ...
-            ),
-            ( # from vertex 1
-                (hop, hop, ...), # to vertex 2
-                (hop, hop, ...), # to vertex 3
-                ...
-            ),
-            ...
-        )
-        """
-        return tuple(
-            tuple(
-                tuple(hop.id for hop in hops)
-                for hops in hops_caches
-            )
-            for hops_caches in self._data
-        )
-
-    def set_from_ids(self, ids, vertices):
-        """
-        Fills own data structures in accordance with a previous return
-        value of ``ids()``.
-        """
-
-        assert len(ids) + 1 == len(vertices)
-
-        for source_id, cache_entries in enumerate(ids):
-            for target_id, hop_ids in enumerate(cache_entries):
-                self._data[source_id][target_id] = tuple(
-                    vertices[hop_id] for hop_id in hop_ids
-                )
+        self._distances = [None] * len(self.vertices)
+
+    def duplicate(self, vertices):
+        """
+        Returns a copy of this cache for (the same graph with other)
+        ``vertices``, which shares the rows with this cache.
+        """
+        dup = self.__class__(vertices)
+        dup._distances = list(self._distances)
+        return dup
+
+    def new_row(self):
+        """
+        Returns an empty (i.e., filled with "unknown") array of distances,
+        to be filled and passed to ``set()``.
+        """
+        return array(self.distances_typecode, [-1]) * len(self.vertices)
+
+    def tobytes(self):
+        """
+        Returns the rows of all vertices (see ``complete()``) as one
+        ``bytes`` object, e.g., to ship them to other processes. See also
+        ``frombytes()``.
+        """
+        assert self.complete()
+        return b"".join(distances.tobytes() for distances in self._distances)
+
+    def frombytes(self, data):
+        """
+        Sets the rows of all vertices from a previous return value of
+        ``tobytes()`` (of a cache for the same graph).
+        """
+        order = len(self.vertices)
+        distances = array(self.distances_typecode, data)
+        assert len(distances) == order * order
+        self._distances = [distances[index:index + order]
+                           for index in range(0, order * order, order)]
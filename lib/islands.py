@@ -0,0 +1,128 @@
+"""
+Island model for the parallel search: every worker process (island)
+keeps its own incumbent graph and enhances it independently. Islands
+exchange their incumbents periodically (migration), along a configurable
+topology.
+"""
+
+from logging import debug, info
+from time import time
+from queue import Empty
+from pickle import dumps, loads, HIGHEST_PROTOCOL
+
+TOPOLOGIES = ("ring", "all-to-all")
+"""
+Supported topologies of migrations between islands.
+"""
+
+
+def neighbours(island_index, islands_count, topology):
+    """
+    Returns the indices of the islands the island ``island_index`` sends
+    its incumbent to.
+    """
+    if islands_count < 2:
+        return ()
+    if topology == "ring":
+        return ((island_index + 1) % islands_count,)
+    if topology == "all-to-all":
+        return tuple(i for i in range(islands_count) if i != island_index)
+    raise ValueError("unknown topology %r" % topology)
+
+
+def pack(graph):
+    """
+    Returns a compact message representing the analyzed ``graph``
+    (to be sent to other processes).
+    See also ``GolfGraph.__getstate__()``.
+    """
+    return dumps(graph, HIGHEST_PROTOCOL)
+
+
+def unpack(message):
+    """
+    Returns an analyzed graph from a return value of ``pack()``.
+    """
+    return loads(message)
+
+
+class Island(object):
+    """
+    A worker process in the island model.
+
+    After initialization, all you need is ``run()`` (which is meant to be
+    the target of a process).
+    """
+
+    def __init__(self, index, enhancer, inboxes, report_queue,
+                 migration_interval, topology):
+        """
+        ``inboxes`` is a sequence of queues - one per island - to receive
+        migrants with. ``report_queue`` receives the incumbent whenever
+        it was enhanced since the last migration.
+        """
+        self.index = index
+        self.enhancer = enhancer
+        self.inboxes = inboxes
+        self.report_queue = report_queue
+        self.migration_interval = migration_interval
+        self.neighbours = neighbours(index, len(inboxes), topology)
+        self.incumbent = None
+
+    def __str__(self):
+        return "island %i (%s)" % (self.index,
+                                   self.enhancer.__class__.__name__)
+
+    def run(self, graph):
+        """
+        Enhances ``graph`` forever and migrates every
+        ``migration_interval`` seconds.
+        """
+        debug("%s started", self)
+
+        self.incumbent = graph
+        enhanced = False
+        next_migration = time() + self.migration_interval
+
+        while self.enhancer.active:
+
+            enhanced_graph = self.enhancer.attempt(self.incumbent)
+            if enhanced_graph is not None:
+                info("%s found %s (%s)", self, enhanced_graph,
+                     self.enhancer.statistics)
+                self.incumbent = enhanced_graph
+                enhanced = True
+
+            if time() < next_migration:
+                continue
+
+            if enhanced:
+                message = pack(self.incumbent)
+                self.report_queue.put(message)
+                self.emigrate(message)
+                enhanced = False
+            self.immigrate()
+            next_migration = time() + self.migration_interval
+
+    def emigrate(self, message):
+        """
+        Sends the (packed) incumbent to the neighbours.
+        """
+        for neighbour in self.neighbours:
+            self.inboxes[neighbour].put(message)
+
+    def immigrate(self):
+        """
+        Replaces the incumbent with received migrants, if they are
+        better.
+        """
+        inbox = self.inboxes[self.index]
+        while True:
+            try:
+                message = inbox.get_nowait()
+            except Empty:
+                return
+            migrant = unpack(message)
+            if migrant < self.incumbent:
+                debug("%s accepts migrant %s", self, migrant)
+                self.incumbent = migrant
@@ -0,0 +1,74 @@
+"""
+Kernels, i.e., the innermost loops of the analysis of graphs
+(breadth-first searches) and of scoring moves, in interchangeable
+implementations:
+
+* ``pure_python``: the reference, which runs everywhere (and is what
+  PyPy3 is fast with, see ``README.rst``)
+* ``numba_jit``: compiled by `Numba <https://numba.pydata.org/>`__, if
+  installed, for CPython
+
+The implementation is chosen at import time: the one named by the
+environment variable ``GRAPHGOLF_KERNELS``, or the first available of
+``IMPLEMENTATIONS``. All implementations provide (and return the same
+results for, see ``test/kernels_test.py``):
+
+* ``adjacency(neighbour_ids)``: converts a list of lists of the
+  neighbours' IDs per vertex ID to the implementation's representation
+  of the graph (the same list for ``pure_python``), to be passed to the
+  functions below
+* ``breadth_first_search(adjacency, source_id, distances, counts=None)``:
+  fills the array ``distances`` (initialized with -1) with the distances
+  from vertex ``source_id``, adds the numbers of vertices per distance
+  to the array ``counts`` (of at least the order's length), if given,
+  and returns a tuple of the number of vertices reached, the
+  eccentricity and the sum of distances of the source
+* ``score(adjacency, bound=None)``: see ``lib.scoring.score()``
+* ``INCREMENTAL_SWAPS``: see ``lib.scoring.score_swaps()``
+"""
+
+from os import environ
+from importlib import import_module
+from logging import debug
+
+IMPLEMENTATIONS = ("numba_jit", "pure_python")
+"""
+Names of the implementations, in order of preference.
+"""
+
+
+def load(name):
+    """
+    Returns the implementation module ``name`` (see
+    ``IMPLEMENTATIONS``). Raises ``ImportError`` if not available.
+    """
+    assert name in IMPLEMENTATIONS, "unknown kernels %r" % name
+    return import_module("%s.%s" % (__name__, name))
+
+
+def available():
+    """
+    Returns a list of the names of the implementations available.
+    """
+    names = []
+    for name in IMPLEMENTATIONS:
+        try:
+            load(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+NAME = environ.get("GRAPHGOLF_KERNELS") or available()[0]
+"""
+Name of the implementation in use.
+"""
+
+_implementation = load(NAME)
+debug("using %s kernels", NAME)
+
+adjacency = _implementation.adjacency
+breadth_first_search = _implementation.breadth_first_search
+score = _implementation.score
+INCREMENTAL_SWAPS = _implementation.INCREMENTAL_SWAPS
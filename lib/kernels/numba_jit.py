@@ -0,0 +1,140 @@
+"""
+Implementation of the kernels (see ``lib.kernels``) compiled by Numba,
+for CPython. Importing this module raises ``ImportError`` if Numba (or
+NumPy) is not installed.
+
+Graphs are represented in the compressed sparse row format, i.e., a
+tuple of NumPy arrays of ``offsets`` and ``targets``: the neighbours'
+IDs of vertex ``v`` are ``targets[offsets[v]:offsets[v + 1]]``.
+
+Arrays of the ``array`` module (as used by ``GolfGraph``) are passed as
+NumPy views (w/o copying).
+"""
+
+import numpy
+from numba import njit
+
+INCREMENTAL_SWAPS = False
+"""
+See ``lib.scoring.score_swaps()``.
+"""
+
+_NO_COUNTS = numpy.zeros(0, numpy.int64)
+
+
+def adjacency(neighbour_ids):
+    """
+    Returns the arrays of offsets and targets of the graph given as list
+    of lists of the neighbours' IDs per vertex ID.
+    """
+    offsets = numpy.zeros(len(neighbour_ids) + 1, numpy.int64)
+    numpy.cumsum([len(ids) for ids in neighbour_ids], out=offsets[1:])
+    targets = numpy.fromiter((neighbour_id for ids in neighbour_ids
+                              for neighbour_id in ids),
+                             numpy.int64, offsets[-1])
+    return offsets, targets
+
+
+def breadth_first_search(adjacency, source_id, distances, counts=None):
+    """
+    See ``lib.kernels``.
+    """
+    offsets, targets = adjacency
+    if counts is None:
+        counts = _NO_COUNTS
+    else:
+        counts = numpy.frombuffer(counts, counts.typecode)
+    return _breadth_first_search(
+        offsets, targets, source_id,
+        numpy.frombuffer(distances, distances.typecode), counts
+    )
+
+
+@njit(cache=True)
+def _breadth_first_search(offsets, targets, source_id, distances, counts):
+    """
+    See ``breadth_first_search()``, with an empty array of ``counts`` if
+    none given.
+    """
+    order = len(offsets) - 1
+    count = len(counts) > 0
+    frontier = numpy.empty(order, numpy.int64)
+    frontier[0] = source_id
+    distances[source_id] = 0
+    head = 0
+    tail = 1
+    eccentricity = 0
+    distance_sum = 0
+    while head < tail:
+        vertex_id = frontier[head]
+        head += 1
+        distance = distances[vertex_id] + 1
+        for index in range(offsets[vertex_id], offsets[vertex_id + 1]):
+            edge_to_id = targets[index]
+            if distances[edge_to_id] < 0:
+                distances[edge_to_id] = distance
+                frontier[tail] = edge_to_id
+                tail += 1
+                eccentricity = distance
+                distance_sum += distance
+                if count:
+                    counts[distance] += 1
+    return tail, eccentricity, distance_sum
+
+
+def score(adjacency, bound=None):
+    """
+    See ``lib.scoring.score()``.
+    """
+    offsets, targets = adjacency
+    if bound is None:
+        bound = (-1, -1)
+    diameter, total_distance = _score(offsets, targets, bound[0], bound[1])
+    if diameter < 0:
+        return None
+    return diameter, total_distance
+
+
+@njit(cache=True)
+def _score(offsets, targets, bound_diameter, bound_total_distance):
+    """
+    See ``score()``, but w/o ``bound`` if ``bound_diameter`` is negative,
+    and returns negative values instead of ``None``.
+
+    We search from one vertex after the other. The diameter and the
+    total distance found so far cannot decrease anymore, so we stop as
+    soon as they are worse than the bound.
+    """
+    order = len(offsets) - 1
+    distances = numpy.empty(order, numpy.int64)
+    frontier = numpy.empty(order, numpy.int64)
+    diameter = 0
+    total_distance = 0
+    for source_id in range(order):
+        distances[:] = -1
+        distances[source_id] = 0
+        frontier[0] = source_id
+        head = 0
+        tail = 1
+        while head < tail:
+            vertex_id = frontier[head]
+            head += 1
+            distance = distances[vertex_id] + 1
+            for index in range(offsets[vertex_id], offsets[vertex_id + 1]):
+                edge_to_id = targets[index]
+                if distances[edge_to_id] < 0:
+                    distances[edge_to_id] = distance
+                    frontier[tail] = edge_to_id
+                    tail += 1
+                    total_distance += distance
+                    if distance > diameter:
+                        diameter = distance
+        if tail < order:
+            return -1, -1
+        if bound_diameter >= 0 and (
+                diameter > bound_diameter or
+                (diameter == bound_diameter and
+                 total_distance > bound_total_distance)
+        ):
+            return -1, -1
+    return diameter, total_distance
@@ -0,0 +1,101 @@
+"""
+Pure Python implementation of the kernels (see ``lib.kernels``), which
+is the reference for other implementations.
+
+Graphs are represented as lists of the neighbours' IDs per vertex ID,
+i.e., ``adjacency()`` is the identity. Since they are cheap to modify,
+``lib.scoring`` evaluates moves by modifying them in place.
+"""
+
+try:
+    popcount = int.bit_count
+except AttributeError:
+    # Python < 3.10
+    def popcount(value):
+        """ Returns the number of bits set in ``value``. """
+        return bin(value).count("1")
+
+INCREMENTAL_SWAPS = True
+"""
+See ``lib.scoring.score_swaps()``.
+"""
+
+
+def adjacency(neighbour_ids):
+    """
+    Returns ``neighbour_ids`` (a list of lists of the neighbours' IDs per
+    vertex ID), which is our representation already.
+    """
+    return neighbour_ids
+
+
+def breadth_first_search(adjacency, source_id, distances, counts=None):
+    """
+    See ``lib.kernels``.
+
+    We walk one "layer" of vertices (with the same distance) at a time,
+    so we update the sums per layer instead of per vertex.
+    """
+    distances[source_id] = 0
+    frontier = [source_id]
+    distance = 0
+    reached = 1
+    distance_sum = 0
+    while True:
+        distance += 1
+        next_frontier = []
+        for vertex_id in frontier:
+            for edge_to_id in adjacency[vertex_id]:
+                if distances[edge_to_id] < 0:
+                    distances[edge_to_id] = distance
+                    next_frontier.append(edge_to_id)
+        if not next_frontier:
+            return reached, distance - 1, distance_sum
+        layer = len(next_frontier)
+        reached += layer
+        distance_sum += distance * layer
+        if counts is not None:
+            counts[distance] += layer
+        frontier = next_frontier
+
+
+def score(adjacency, bound=None):
+    """
+    See ``lib.scoring.score()``.
+
+    The breadth-first searches from all vertices run at once,
+    bit-parallel: bit ``s`` of ``reached[v]`` tells whether vertex ``v``
+    has been reached from source ``s``. One step of all searches is one
+    bitwise "or" per edge (of Python's arbitrary-length integers), what
+    is way faster than walking from one vertex after the other.
+    """
+    order = len(adjacency)
+    pairs = order * order
+    reached = [1 << vertex_id for vertex_id in range(order)]
+    missing = pairs - order
+    diameter = 0
+    total_distance = 0
+
+    while missing:
+        # all missing pairs are at a distance greater than ``diameter``
+        total_distance += missing
+        diameter += 1
+        if bound is not None and (
+                diameter > bound[0] or
+                (diameter == bound[0] and total_distance > bound[1])
+        ):
+            return None
+
+        next_reached = []
+        for vertex_reached, vertex_neighbours in zip(reached, adjacency):
+            for neighbour_id in vertex_neighbours:
+                vertex_reached |= reached[neighbour_id]
+            next_reached.append(vertex_reached)
+        reached = next_reached
+
+        last_missing = missing
+        missing = pairs - sum(map(popcount, reached))
+        if missing == last_missing:
+            return None
+
+    return diameter, total_distance
@@ -0,0 +1,80 @@
+"""
+Exact lower bounds for the diameter and the total distance of graphs of
+a given order and degree (Moore bound).
+
+We work with integers only: the total distance is the sum of the
+lengths of the shortest paths between all *ordered* pairs of vertices,
+i.e., the average shortest path length is
+``total_distance / (order * (order - 1))``.
+This allows exact comparisons (no floating point equality issues).
+
+Based on http://research.nii.ac.jp/graphgolf/py/create-random.py
+"""
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def lower_bounds(order, degree):
+    """
+    Returns a tuple of the lower bounds of (diameter, total distance)
+    for the given ``order`` and ``degree``.
+
+    Returns ``(None, None)`` if there is no connected graph with this
+    ``order`` and ``degree``.
+    """
+    if order < 2:
+        return 0, 0
+
+    if degree < 1 or (degree == 1 and order > 2):
+        return None, None
+
+    # every vertex reaches at most ``degree * (degree-1)^(r-1)`` other
+    # vertices with ``r`` hops; we sum up the distances of one vertex
+    # to all others and fill the layers greedily
+    vertex_distance = 0
+    reached = 1
+    diameter = 0
+    layer = degree
+    while reached + layer < order:
+        reached += layer
+        diameter += 1
+        vertex_distance += diameter * layer
+        layer *= degree - 1
+    diameter += 1
+    vertex_distance += diameter * (order - reached)
+
+    return diameter, order * vertex_distance
+
+
+def table(orders, degrees):
+    """
+    Returns a dictionary which maps all combinations of ``orders`` and
+    ``degrees`` to their lower bounds (see ``lower_bounds``).
+    """
+    return {
+        (order, degree): lower_bounds(order, degree)
+        for order in orders
+        for degree in degrees
+    }
+
+
+def aspl(total_distance, order):
+    """
+    Returns the average shortest path length for ``total_distance``
+    (for display; please compare total distances).
+    """
+    if order < 2:
+        return 0.0
+    return total_distance / (order * (order - 1))
+
+
+def gaps(order, degree, diameter, total_distance):
+    """
+    Returns a tuple of how far ``diameter`` and ``total_distance`` are
+    above their lower bounds.
+    """
+    diameter_bound, total_distance_bound = lower_bounds(order, degree)
+    if diameter_bound is None:
+        return None, None
+    return diameter - diameter_bound, total_distance - total_distance_bound
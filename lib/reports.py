@@ -0,0 +1,112 @@
+"""
+Reports (see ``AbstractBase.enhance()``) from enhancer processes to the
+coordinating process, through one pipe per process.
+
+Compared to a ``multiprocessing.Manager().Queue()``, this needs no
+server process and every report is written and read once (instead of
+being proxied through the server via sockets).
+"""
+
+from logging import debug
+from multiprocessing import Pipe
+from multiprocessing.connection import wait
+
+
+class ReportWriter(object):
+    """
+    The sending end of a pipe, to be passed to one process as
+    ``report_queue``.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def put(self, report):
+        """
+        Sends ``report`` (must be picklable).
+        """
+        self.connection.send(report)
+
+
+class ReportPipes(object):
+    """
+    The receiving ends of the pipes of many processes.
+    """
+
+    def __init__(self):
+        self._readers = []
+        self._writers = []
+        """
+        Our copies of the sending ends, see ``started()``.
+        """
+
+    def writer(self):
+        """
+        Returns a new ``ReportWriter`` for one process.
+        """
+        reader, writer = Pipe(duplex=False)
+        self._readers.append(reader)
+        self._writers.append(writer)
+        return ReportWriter(writer)
+
+    def started(self):
+        """
+        To be called after the processes received their writers (i.e.,
+        have been started). Closes our copies of the sending ends, so
+        that we notice when processes end.
+        """
+        for writer in self._writers:
+            writer.close()
+        self._writers = []
+
+    def get(self, timeout=None):
+        """
+        Blocks until a report arrives and returns it. Returns ``None``
+        if ``timeout`` seconds passed or no process can report anymore.
+        """
+        while self._readers:
+            ready = wait(self._readers, timeout)
+            if not ready:
+                return None
+            for reader in ready:
+                report = self._receive(reader)
+                if report is not None:
+                    return report
+        return None
+
+    def drain(self):
+        """
+        Returns a list of all reports that arrived already, w/o
+        blocking.
+        """
+        reports = []
+        for reader in wait(self._readers, 0):
+            while reader.poll():
+                report = self._receive(reader)
+                if report is None:
+                    break
+                reports.append(report)
+        return reports
+
+    def _receive(self, reader):
+        """
+        Returns the next report from ``reader`` or ``None``, if the
+        process at the other end is gone (we drop its pipe then).
+        """
+        try:
+            return reader.recv()
+        except (EOFError, OSError):
+            # also if killed while sending, the message is incomplete
+            debug("dropping pipe of ended process")
+            self._readers.remove(reader)
+            reader.close()
+            return None
+
+    def close(self):
+        """
+        Closes all pipes.
+        """
+        for connection in self._readers + self._writers:
+            connection.close()
+        self._readers = []
+        self._writers = []
@@ -0,0 +1,115 @@
+"""
+On-disk cache of the analysis of edges files, so that restarting from an
+edges file (e.g., one we wrote before) does not analyze it again.
+
+Entries are keyed by the content of the edges file (and the order and
+degree of the graph), and contain the pickled graph, i.e., its edges and
+analysis results (see ``GolfGraph.__getstate__()``). Please note that
+unpickling executes code, i.e., the cache directory must not be writable
+for others.
+"""
+
+from hashlib import sha256
+from logging import debug, info, warning
+from os import makedirs, listdir, remove, replace, getpid
+from os.path import join, getmtime
+from pickle import dump, load, HIGHEST_PROTOCOL
+
+from lib.edges_file import CHUNK_SIZE
+from lib.graph_elements import GolfGraph
+
+
+class ResultCache(object):
+    """
+    See module docstring.
+    """
+
+    VERSION = 1
+    """
+    Part of the keys, to be increased whenever the pickled state of
+    graphs changes incompatibly.
+    """
+
+    MAX_ENTRIES = 64
+    """
+    Number of entries to keep (the most recently written ones).
+    """
+
+    SUFFIX = ".graph"
+    """
+    File name suffix of the entries.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path(self, filename, order, degree):
+        """
+        Returns the path of the entry for the edges file ``filename`` of a
+        graph of ``order`` and ``degree``.
+        """
+        key = sha256(b"%i %i %i\n" % (self.VERSION, order, degree))
+        with open(filename, "rb") as open_file:
+            for chunk in iter(lambda: open_file.read(CHUNK_SIZE), b""):
+                key.update(chunk)
+        return join(self.directory, key.hexdigest() + self.SUFFIX)
+
+    def get(self, filename, order, degree):
+        """
+        Returns the analyzed graph of ``order`` and ``degree`` from the
+        edges file ``filename``, or ``None`` if not cached.
+        """
+        path = self.path(filename, order, degree)
+        try:
+            with open(path, "rb") as open_file:
+                graph = load(open_file)
+        except FileNotFoundError:
+            debug("%s not in result cache", filename)
+            return None
+        except Exception as exception:  # whatever broken entries raise
+            warning("ignoring result cache entry %s: %s", path, exception)
+            return None
+
+        if not isinstance(graph, GolfGraph) or \
+                (graph.order, graph.degree) != (order, degree) or \
+                graph.dirty:
+            warning("ignoring result cache entry %s: unexpected content",
+                    path)
+            return None
+
+        info("loaded analysis of %s from result cache", filename)
+        return graph
+
+    def put(self, filename, graph):
+        """
+        Stores the analyzed ``graph`` as the one of the edges file
+        ``filename``.
+        """
+        assert not graph.dirty
+        makedirs(self.directory, exist_ok=True)
+        path = self.path(filename, graph.order, graph.degree)
+
+        # write atomically, since other processes might read concurrently
+        temporary_path = "%s.%i.tmp" % (path, getpid())
+        with open(temporary_path, "wb") as open_file:
+            dump(graph, open_file, HIGHEST_PROTOCOL)
+        replace(temporary_path, path)
+        debug("stored analysis of %s in result cache", filename)
+
+        self.prune()
+
+    def prune(self):
+        """
+        Removes all but the ``MAX_ENTRIES`` most recently written entries.
+        """
+        paths = [join(self.directory, name)
+                 for name in listdir(self.directory)
+                 if name.endswith(self.SUFFIX)]
+        if len(paths) <= self.MAX_ENTRIES:
+            return
+        paths.sort(key=getmtime)
+        for path in paths[:-self.MAX_ENTRIES]:
+            try:
+                remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,149 @@
+"""
+See docstring of class ``EnhancerScheduler``.
+"""
+
+from math import log, sqrt
+from logging import debug
+
+
+class EnhancerScheduler(object):
+    """
+    Assigns worker slots to enhancer classes, based on how many
+    improvements they yielded per CPU-second recently.
+
+    This is a multi-armed bandit (UCB1-style) with one arm per enhancer
+    class. Since the enhancers that suit the search best change over
+    time (e.g., far from vs. close to the lower bounds), old observations
+    are discounted with ``DECAY`` after each round.
+
+    We approximate CPU-seconds by wall-clock seconds of busy worker
+    processes (one process occupies one processor).
+    """
+
+    DECAY = 0.9
+    """
+    Factor to discount previous observations with after each round.
+    Lower values make the scheduler adapt faster to phase changes.
+    """
+
+    EXPLORATION = 1.0
+    """
+    Weight of the exploration term of UCB1.
+    """
+
+    def __init__(self, enhancer_classes, slots):
+        """
+        ``enhancer_classes`` are the arms (must be unique), ``slots`` is
+        the number of worker processes we can run in parallel.
+        """
+        assert len(enhancer_classes) == len(set(enhancer_classes)), \
+               "please make sure there are no duplicate enhancer classes"
+        assert slots > 0
+
+        self.enhancer_classes = list(enhancer_classes)
+        self.slots = slots
+
+        self.improvements = {cls: 0.0 for cls in self.enhancer_classes}
+        """
+        (Discounted) number of improvements found per enhancer class.
+        """
+
+        self.seconds = {cls: 0.0 for cls in self.enhancer_classes}
+        """
+        (Discounted) number of CPU-seconds spent per enhancer class.
+        """
+
+    def __str__(self):
+        return " ".join(
+            "%s=%.3f/s" % (cls.__name__, self.rate(cls))
+            for cls in self.enhancer_classes
+        )
+
+    def rate(self, enhancer_cls):
+        """
+        Returns the observed number of improvements per CPU-second of
+        ``enhancer_cls``.
+        """
+        seconds = self.seconds[enhancer_cls]
+        if not seconds:
+            return 0.0
+        return self.improvements[enhancer_cls] / seconds
+
+    def record(self, slot_classes, seconds, improved_classes):
+        """
+        Updates the statistics after a round of running the enhancers
+        ``slot_classes`` (one item per slot, as returned by ``assign``)
+        for ``seconds``. ``improved_classes`` contains the class of every
+        enhancer that submitted an improvement in this round.
+        """
+        debug("recording round of %f seconds", seconds)
+
+        improvements = self.improvements
+        spent = self.seconds
+        decay = self.DECAY
+
+        for cls in self.enhancer_classes:
+            improvements[cls] *= decay
+            spent[cls] *= decay
+
+        for cls in slot_classes:
+            spent[cls] += seconds
+
+        for cls in improved_classes:
+            improvements[cls] += 1
+
+    def drop(self, enhancer_cls):
+        """
+        Removes ``enhancer_cls`` from the arms, e.g., since it is not
+        applicable (anymore) or does not enhance anymore (see
+        ``AbstractBase.active``).
+        """
+        debug("dropping %s", enhancer_cls.__name__)
+        self.enhancer_classes.remove(enhancer_cls)
+        del self.improvements[enhancer_cls]
+        del self.seconds[enhancer_cls]
+
+    def assign(self):
+        """
+        Returns a list of length ``slots`` with an enhancer class per
+        slot (or an empty list, if there is no enhancer class left).
+
+        Every enhancer class that has not been run yet gets a slot first.
+        Remaining slots are handed out one by one to the class with the
+        highest upper confidence bound, whereby every slot handed out
+        counts as (a virtual) average CPU-second spent already. The latter
+        spreads the slots across promising classes, instead of giving all
+        slots to the single best one.
+        """
+        if not self.enhancer_classes:
+            return []
+
+        spent = dict(self.seconds)
+        improvements = self.improvements
+
+        assigned = [cls for cls in self.enhancer_classes if not spent[cls]]
+        assigned = assigned[:self.slots]
+
+        # the virtual time one slot spends on average
+        total = sum(spent.values())
+        unit = total / len(spent) or 1.0
+
+        for cls in assigned:
+            spent[cls] += unit
+
+        # we measure time in ``unit``s, so that rewards (improvements
+        # per unit) and the exploration term are of similar magnitude
+        exploration = self.EXPLORATION
+        while len(assigned) < self.slots:
+            plays = sum(spent.values()) / unit
+            best_cls = max(
+                self.enhancer_classes,
+                key=lambda cls: (improvements[cls] * unit / spent[cls] +
+                                 exploration *
+                                 sqrt(log(plays + 1) /
+                                      (spent[cls] / unit)))
+            )
+            assigned.append(best_cls)
+            spent[best_cls] += unit
+
+        return assigned
@@ -0,0 +1,226 @@
+"""
+Fast scoring of graphs (diameter and total distance) w/o analyzing
+them, for enhancers which evaluate many candidates.
+
+The breadth-first searches from all vertices run at once (see
+``lib.kernels``, e.g., bit-parallel in ``lib.kernels.pure_python``),
+what is way faster than walking from one vertex after the other. In
+contrast to ``GolfGraph.analyze()``, we do not learn the paths,
+however.
+
+Graphs are given as lists of the neighbours' IDs per vertex ID (see
+``neighbours()``), which are cheap to modify for evaluating candidates.
+"""
+
+from lib import kernels
+from lib.kernels.pure_python import popcount
+
+
+def neighbours(graph):
+    """
+    Returns a list of lists of the neighbours' IDs per vertex ID of
+    ``graph``.
+    """
+    return [[edge_to.id for edge_to in vertex.edges_to]
+            for vertex in graph.vertices]
+
+
+def score(neighbours, bound=None):
+    """
+    Returns a tuple of the diameter and the total distance of the graph
+    given as ``neighbours`` (see module docstring).
+
+    Returns ``None`` if the graph is partitioned or as soon as we know
+    that it is worse than ``bound`` (a tuple of a diameter and a total
+    distance, compared lexicographically).
+    """
+    return kernels.score(kernels.adjacency(neighbours), bound)
+
+
+def levels(neighbours):
+    """
+    Returns a tuple of a list of ``reached`` (see module docstring) per
+    distance, up to the diameter, and a list of the numbers of pairs
+    missing at those distances of the connected graph given as
+    ``neighbours``.
+    """
+    order = len(neighbours)
+    pairs = order * order
+    reached = [1 << vertex_id for vertex_id in range(order)]
+    reached_levels = [reached]
+    missing_levels = [pairs - order]
+
+    while missing_levels[-1]:
+        next_reached = []
+        for vertex_reached, vertex_neighbours in zip(reached, neighbours):
+            for neighbour_id in vertex_neighbours:
+                vertex_reached |= reached[neighbour_id]
+            next_reached.append(vertex_reached)
+        reached = next_reached
+        reached_levels.append(reached)
+        missing_levels.append(pairs - sum(map(popcount, reached)))
+        assert missing_levels[-1] < missing_levels[-2], "partitioned"
+
+    return reached_levels, missing_levels
+
+
+def swap(neighbours, swap):
+    """
+    Applies ``swap`` (see ``score_swaps()``) to ``neighbours`` in place.
+    """
+    a_id, b_id, c_id, d_id = swap
+    neighbours[a_id].remove(b_id)
+    neighbours[b_id].remove(a_id)
+    neighbours[c_id].remove(d_id)
+    neighbours[d_id].remove(c_id)
+    neighbours[a_id].append(c_id)
+    neighbours[c_id].append(a_id)
+    neighbours[b_id].append(d_id)
+    neighbours[d_id].append(b_id)
+
+
+def unswap(neighbours, swap):
+    """
+    Reverts ``swap()`` of ``swap`` (the last one) on ``neighbours``,
+    except for the order of the IDs.
+    """
+    a_id, b_id, c_id, d_id = swap
+    for vertex_id in swap:
+        neighbours[vertex_id].pop()
+    neighbours[a_id].append(b_id)
+    neighbours[b_id].append(a_id)
+    neighbours[c_id].append(d_id)
+    neighbours[d_id].append(c_id)
+
+
+SPARSE_FRACTION = 4
+"""
+We follow the changes of ``reached`` (see ``score_swaps()``) while they
+affect less than one in ``SPARSE_FRACTION`` vertices, and search as in
+``score()`` otherwise.
+"""
+
+
+def score_swaps(neighbours, swaps, bound=None):
+    """
+    Returns a list of scores (see ``score()``) of the connected graph
+    given as ``neighbours`` with each of ``swaps`` applied. A swap is a
+    tuple of vertex IDs ``(a, b, c, d)``, which replaces the edges a-b
+    and c-d with a-c and b-d (which must not exist). ``neighbours`` is
+    modified while scoring, but restored afterwards (except for the
+    order of the IDs).
+
+    The score of a swap is ``None`` if the graph would be partitioned or
+    as soon as it is known to be worse than ``bound`` or than the score
+    of a swap before it. I.e., the best swaps keep their scores.
+
+    The searches of the graph itself (see ``levels()``) are shared by
+    the swaps: a swap changes ``reached`` only around its vertices at
+    first, and hardly anywhere once almost all pairs are reached. So,
+    we only follow the vertices whose ``reached`` differs from the
+    graph's while there are few of them. This pays off for the
+    bit-parallel searches of pure Python only, i.e., other kernels (see
+    ``lib.kernels``) score the swapped graphs one after the other.
+    """
+    if not kernels.INCREMENTAL_SWAPS:
+        scores = []
+        for candidate_swap in swaps:
+            swap(neighbours, candidate_swap)
+            score = kernels.score(kernels.adjacency(neighbours), bound)
+            unswap(neighbours, candidate_swap)
+            scores.append(score)
+            if score is not None and (bound is None or score < bound):
+                bound = score
+        return scores
+
+    order = len(neighbours)
+    pairs = order * order
+    reached_levels, missing_levels = levels(neighbours)
+    last_level = len(reached_levels) - 1
+    scores = []
+
+    for candidate_swap in swaps:
+        swap(neighbours, candidate_swap)
+        # ``reached`` of the vertices where it differs from the graph's,
+        # or ``reached`` of all vertices if there are too many of them
+        changed = {}
+        reached = None
+        missing = missing_levels[0]
+        diameter = 0
+        total_distance = 0
+        score = None
+
+        while missing:
+            total_distance += missing
+            diameter += 1
+            if bound is not None and (
+                    diameter > bound[0] or
+                    (diameter == bound[0] and total_distance > bound[1])
+            ):
+                break
+
+            unchanged_reached = reached_levels[min(diameter - 1, last_level)]
+            unchanged_next_reached = reached_levels[min(diameter, last_level)]
+            unchanged_missing = missing_levels[min(diameter, last_level)]
+            last_missing = missing
+
+            if reached is None and len(changed) * SPARSE_FRACTION < order:
+                affected = set(candidate_swap)
+                for vertex_id in changed:
+                    affected.add(vertex_id)
+                    affected.update(neighbours[vertex_id])
+                get_changed = changed.get
+                next_changed = {}
+                delta = 0
+                for vertex_id in affected:
+                    vertex_reached = get_changed(
+                        vertex_id, unchanged_reached[vertex_id]
+                    )
+                    for neighbour_id in neighbours[vertex_id]:
+                        vertex_reached |= get_changed(
+                            neighbour_id, unchanged_reached[neighbour_id]
+                        )
+                    if vertex_reached != unchanged_next_reached[vertex_id]:
+                        next_changed[vertex_id] = vertex_reached
+                        delta += (popcount(vertex_reached) - popcount(
+                            unchanged_next_reached[vertex_id]
+                        ))
+                changed = next_changed
+                missing = unchanged_missing - delta
+
+            else:
+                if reached is None:
+                    reached = unchanged_reached[:]
+                    for vertex_id, vertex_reached in changed.items():
+                        reached[vertex_id] = vertex_reached
+                next_reached = []
+                for vertex_reached, vertex_neighbours in zip(reached,
+                                                             neighbours):
+                    for neighbour_id in vertex_neighbours:
+                        vertex_reached |= reached[neighbour_id]
+                    next_reached.append(vertex_reached)
+                reached = next_reached
+                missing = pairs - sum(map(popcount, reached))
+
+                # (only) then, the changes might have become few again
+                if missing == unchanged_missing:
+                    changed = {
+                        vertex_id: vertex_reached
+                        for vertex_id, (vertex_reached, unchanged) in
+                        enumerate(zip(reached, unchanged_next_reached))
+                        if vertex_reached != unchanged
+                    }
+                    if len(changed) * SPARSE_FRACTION < order:
+                        reached = None
+
+            if missing == last_missing:
+                break
+        else:
+            score = diameter, total_distance
+
+        unswap(neighbours, candidate_swap)
+        scores.append(score)
+        if score is not None and (bound is None or score < bound):
+            bound = score
+
+    return scores
@@ -0,0 +1,103 @@
+"""
+Statistical screening of candidate graphs: we estimate the total
+distance of a candidate from breadth-first searches from a sample of
+source vertices, to reject clearly worse candidates before their exact
+(and expensive) analysis.
+"""
+
+from logging import debug
+from random import sample
+from statistics import NormalDist, mean, variance
+
+
+class Screening(object):
+    """
+    Rejects candidates whose total distance is greater than the one of
+    the incumbent with high confidence.
+
+    The sample is stratified by the eccentricities of the vertices in the
+    incumbent, since the sum of distances from a vertex depends heavily
+    on how central it is.
+    """
+
+    def __init__(self, sources, false_reject_rate):
+        """
+        ``sources`` is the (approximate) number of sources to sample.
+        ``false_reject_rate`` is the probability to reject a candidate
+        with a total distance not greater than the incumbent's.
+        """
+        assert sources > 0
+        assert 0 < false_reject_rate < 1
+        self.sources = sources
+        self.false_reject_rate = false_reject_rate
+        self.z = NormalDist().inv_cdf(1 - false_reject_rate)
+        """
+        (One-sided) number of standard errors for the confidence bound.
+        """
+
+        self._incumbent = None
+        self._strata = None
+
+    def strata(self, incumbent):
+        """
+        Returns a list of lists of vertex IDs with equal eccentricities
+        in ``incumbent`` (computed once per incumbent).
+        """
+        if incumbent is not self._incumbent:
+            strata = {}
+            for vertex_id, eccentricity in enumerate(incumbent.eccentricities):
+                strata.setdefault(eccentricity, []).append(vertex_id)
+            self._strata = list(strata.values())
+            self._incumbent = incumbent
+        return self._strata
+
+    def estimate(self, candidate, incumbent):
+        """
+        Returns a tuple of the estimated total distance of the (connected,
+        possibly dirty) ``candidate``, its standard error and the
+        greatest distance found.
+
+        Sources are allocated to the strata (see ``strata()``)
+        proportionally, but at least two per stratum (to be able to
+        estimate its variance).
+        """
+        order = candidate.order
+        vertices = candidate.vertices
+        distances_from = candidate.distances_from
+        estimate = 0.0
+        error_variance = 0.0
+        max_distance = 0
+
+        for stratum in self.strata(incumbent):
+            size = len(stratum)
+            count = min(size, max(2, round(self.sources * size / order)))
+            sums = []
+            for vertex_id in sample(stratum, count):
+                distances = distances_from(vertices[vertex_id])
+                sums.append(sum(distances))
+                max_distance = max(max_distance, max(distances))
+            estimate += size * mean(sums)
+            if count < size:
+                error_variance += (size * size * (1 - count / size) *
+                                   variance(sums) / count)
+
+        return estimate, error_variance ** 0.5, max_distance
+
+    def rejects(self, candidate, incumbent):
+        """
+        Returns whether ``candidate`` has a greater total distance than
+        ``incumbent`` with high confidence, i.e., the lower confidence
+        bound of its total distance is greater than the one of
+        ``incumbent``, and its diameter is not less (since the diameter
+        would make it better, see ``GolfGraph.__lt__``).
+
+        Please note that we do not consider the mspl, i.e., we might
+        reject a candidate which is better (only) by its mspl.
+        """
+        estimate, error, max_distance = self.estimate(candidate, incumbent)
+        rejected = (estimate - self.z * error > incumbent.total_distance and
+                    max_distance >= incumbent.diameter)
+        debug("estimated total distance %.1f +/- %.1f (incumbent: %i)%s",
+              estimate, error, incumbent.total_distance,
+              ", rejected" if rejected else "")
+        return rejected
@@ -0,0 +1,179 @@
+"""
+Validation of graphs given as flat arrays of edge IDs (see
+``GolfGraph.edge_ids()``), e.g., before loading them into a graph.
+
+All checks run in (near) linear time in the number of edges, so this is
+feasible for files with millions of edges. All problems found are
+collected in a ``ValidationReport`` (instead of stopping at the first).
+"""
+
+from array import array
+
+
+class ValidationError(ValueError):
+    """
+    Raised when a graph did not pass the validation.
+    """
+
+    def __init__(self, report):
+        super().__init__(str(report))
+        self.report = report
+
+
+class ValidationReport(object):
+    """
+    Collects the problems found during validation, and some statistics.
+    """
+
+    EXAMPLES_PER_KIND = 5
+    """
+    Maximum number of examples we keep per kind of problem.
+    """
+
+    def __init__(self, order, degree, edges_count):
+        self.order = order
+        self.degree = degree
+        self.edges_count = edges_count
+
+        self.counts = {}
+        """
+        Number of problems per kind of problem.
+        """
+
+        self.examples = {}
+        """
+        Some examples (i.e., human-readable details) per kind of problem.
+        """
+
+        self.degree_histogram = []
+        """
+        Number of vertices (value) per degree (index).
+        """
+
+        self.unreachable = None
+        """
+        Number of vertices unreachable from vertex 0 (``None`` if we
+        could not check).
+        """
+
+    def __str__(self):
+        lines = ["%i edges for order %i and degree %i: %s" % (
+            self.edges_count, self.order, self.degree,
+            "ok" if self.ok else "invalid"
+        )]
+        for kind, count in sorted(self.counts.items()):
+            lines.append("  %i x %s, e.g.: %s" % (
+                count, kind, ", ".join(self.examples[kind])
+            ))
+        lines.append("  vertices per degree: %s" % ", ".join(
+            "%i: %i" % (degree, count)
+            for degree, count in enumerate(self.degree_histogram)
+            if count
+        ))
+        return "\n".join(lines)
+
+    @property
+    def ok(self):
+        """
+        Returns whether no problems were found.
+        """
+        return not self.counts
+
+    def add(self, kind, example):
+        """
+        Records a problem of ``kind`` with a human-readable ``example``.
+        """
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        examples = self.examples.setdefault(kind, [])
+        if len(examples) < self.EXAMPLES_PER_KIND:
+            examples.append(example)
+
+
+def validate(order, degree, edge_ids):
+    """
+    Returns a ``ValidationReport`` for the graph of ``order`` and
+    ``degree`` with the edges ``edge_ids`` (flat, i.e., ``[a0, b0, a1,
+    b1, ...]``).
+
+    Checks for vertex IDs out of range, self-loops, duplicate edges,
+    exceeded degrees and whether the graph is connected.
+    Edges are referred to by their index (which equals the line number
+    of an edges file without empty lines, minus one).
+    """
+    edges_count = len(edge_ids) // 2
+    report = ValidationReport(order, degree, edges_count)
+
+    # vertex ranges and self-loops; we keep the valid edges as
+    # "keys" (``lower ID * order + higher ID``) for the following checks
+    degrees = array("L", [0]) * order
+    keys = []
+    ids = iter(edge_ids)
+    for index, (vertex_a_id, vertex_b_id) in enumerate(zip(ids, ids)):
+        if not (0 <= vertex_a_id < order and 0 <= vertex_b_id < order):
+            report.add("vertex out of range", "edge %i (%i %i)" % (
+                index, vertex_a_id, vertex_b_id
+            ))
+            continue
+        if vertex_a_id == vertex_b_id:
+            report.add("self-loop", "edge %i (%i %i)" % (
+                index, vertex_a_id, vertex_b_id
+            ))
+            continue
+        degrees[vertex_a_id] += 1
+        degrees[vertex_b_id] += 1
+        if vertex_a_id < vertex_b_id:
+            keys.append(vertex_a_id * order + vertex_b_id)
+        else:
+            keys.append(vertex_b_id * order + vertex_a_id)
+
+    # duplicates are neighbours after sorting
+    keys.sort()
+    previous_key = None
+    for key in keys:
+        if key == previous_key:
+            report.add("duplicate edge", "%i %i" % divmod(key, order))
+        previous_key = key
+
+    # degrees
+    histogram = [0] * (max(degrees, default=0) + 1)
+    for vertex_id, vertex_degree in enumerate(degrees):
+        histogram[vertex_degree] += 1
+        if vertex_degree > degree:
+            report.add("degree exceeded", "vertex %i (%i edges)" % (
+                vertex_id, vertex_degree
+            ))
+    report.degree_histogram = histogram
+
+    # connectivity, breadth-first through a compact adjacency structure
+    # (``neighbours[offsets[i]:offsets[i+1]]`` are the neighbours of i)
+    offsets = array("L", [0]) * (order + 1)
+    for vertex_id in range(order):
+        offsets[vertex_id + 1] = offsets[vertex_id] + degrees[vertex_id]
+    neighbours = array("L", [0]) * offsets[order]
+    positions = offsets[:-1]
+    for key in keys:
+        vertex_a_id, vertex_b_id = divmod(key, order)
+        neighbours[positions[vertex_a_id]] = vertex_b_id
+        positions[vertex_a_id] += 1
+        neighbours[positions[vertex_b_id]] = vertex_a_id
+        positions[vertex_b_id] += 1
+
+    if order:
+        reached = bytearray(order)
+        reached[0] = 1
+        frontier = [0]
+        while frontier:
+            next_frontier = []
+            for vertex_id in frontier:
+                for neighbour_id in neighbours[offsets[vertex_id]:
+                                              offsets[vertex_id + 1]]:
+                    if not reached[neighbour_id]:
+                        reached[neighbour_id] = 1
+                        next_frontier.append(neighbour_id)
+            frontier = next_frontier
+        report.unreachable = order - sum(reached)
+        if report.unreachable:
+            report.add("partitioned", "%i vertices unreachable from "
+                                      "vertex 0" % report.unreachable)
+
+    return report
@@ -0,0 +1,94 @@
+"""
+Tests batch mode helpers.
+"""
+
+from tempfile import NamedTemporaryFile
+from argparse import Namespace
+from unittest.mock import patch
+
+from test import BaseTest
+from lib.graph_elements import GolfGraph
+from lib.enhancers import RandomlyReplaceTwoEdges
+from lib import batch
+
+class FakeInstance(object):
+    """ An instance with a fixed gap. """
+
+    def __init__(self, gap):
+        self._gap = gap
+
+    def gap(self):
+        """ Returns the fixed gap. """
+        return self._gap
+
+class BatchTest(BaseTest):
+    """
+    See module docstring.
+    """
+
+    def test_read_manifest(self):
+        """
+        Tests parsing of manifests.
+        """
+        with NamedTemporaryFile("w") as manifest:
+            manifest.write("# comment\n\n32 5\n256 18 edges.txt\n")
+            manifest.flush()
+            instances = batch.read_manifest(manifest.name)
+        self.assertEqual(
+            [(32, 5, None), (256, 18, "edges.txt")],
+            [(i.order, i.degree, i.edges_filename) for i in instances]
+        )
+
+        with NamedTemporaryFile("w") as manifest:
+            manifest.write("32\n")
+            manifest.flush()
+            with self.assertRaises(ValueError):
+                batch.read_manifest(manifest.name)
+
+    def test_allocate(self):
+        """
+        Tests whether slots are allocated in proportion to gaps.
+        """
+        small, large, none = (FakeInstance(0.1), FakeInstance(0.3),
+                              FakeInstance(0.0))
+        allocated = batch.allocate((small, large, none), 8)
+        self.assertEqual(8, len(allocated))
+        self.assertEqual(6, allocated.count(large))
+        self.assertEqual(2, allocated.count(small))
+        self.assertEqual([], batch.allocate((none,), 8))
+
+    def test_gap(self):
+        """
+        Tests the gap of an instance.
+        """
+        instance = batch.Instance(32, 5)
+        instance.graph = batch.new_graph(instance, None)
+        self.assertGreater(instance.gap(), 0)
+
+    def test_enhance_for(self):
+        """
+        Tests enhancing a graph for some time.
+        """
+        graph = GolfGraph(32, 5)
+        graph.add_as_many_random_edges_as_possible()
+        graph.analyze()
+        message = batch.enhance_for(RandomlyReplaceTwoEdges,
+                                    batch.pack(graph), 1)
+        self.assertIsNotNone(message)
+        self.assertTrue(batch.unpack(message) < graph)
+
+    def test_enhance_for_screening(self):
+        """
+        Tests whether the enhancer is configured by the CLI arguments.
+        """
+        graph = GolfGraph(32, 5)
+        graph.add_as_many_random_edges_as_possible()
+        graph.analyze()
+        args = Namespace(screening_sources=8, false_reject_rate=0.01)
+        with patch("lib.enhancers.Screening") as screening:
+            screening.return_value.rejects.return_value = True
+            message = batch.enhance_for(RandomlyReplaceTwoEdges,
+                                        batch.pack(graph), 0.2, args)
+        screening.assert_called_once_with(8, 0.01)
+        # all candidates screened out
+        self.assertIsNone(message)
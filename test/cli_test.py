@@ -4,10 +4,12 @@ Tests various CLI operations.
 
 from sys import argv
 from os import remove
+from tempfile import TemporaryDirectory
 
 from test import BaseTest
 from lib.cli import Cli
 from lib.graph_elements import GolfGraph
+from lib.result_cache import ResultCache
 
 class CliTest(BaseTest):
     """
@@ -45,3 +47,28 @@ class CliTest(BaseTest):
                 )
 
             remove(filename)
+
+    def test_load_analyzed_edges(self):
+        """
+        Tests that the analysis of edges files written before is taken
+        from the result cache.
+        """
+        with TemporaryDirectory() as directory:
+            self.cli.result_cache = ResultCache(directory)
+            self.cli.best_graph = GolfGraph(32, 3)
+            self.cli.best_graph.add_as_many_random_edges_as_possible()
+            self.cli.best_graph.analyze()
+            filename = self.cli.current_edges_filename()
+            self.cli.write_edges()
+
+            graph = GolfGraph(32, 3)
+            cached_graph = self.cli.load_analyzed_edges(filename, graph)
+            self.assertIsNot(cached_graph, graph)
+            self.assertEqual(cached_graph.metrics(),
+                             self.cli.best_graph.metrics())
+
+            self.cli.result_cache = None
+            graph = self.cli.load_analyzed_edges(filename, graph)
+            self.assertEqual(graph.metrics(), self.cli.best_graph.metrics())
+
+            remove(filename)
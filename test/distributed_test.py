@@ -0,0 +1,73 @@
+"""
+Tests the distributed search (on localhost).
+"""
+
+from multiprocessing import Process
+
+from test import BaseTest
+from lib.graph_elements import GolfGraph
+from lib.enhancers import RandomlyReplaceTwoEdges
+from lib.distributed import Coordinator, Worker, serve, connect
+
+class DistributedTest(BaseTest):
+    """
+    See module docstring.
+    """
+
+    AUTHKEY = "test"
+
+    def setUp(self):
+        """
+        Serves a coordinator for a random graph.
+        """
+        graph = GolfGraph(32, 5)
+        graph.add_as_many_random_edges_as_possible()
+        graph.analyze()
+        self.graph = graph
+        self.coordinator = Coordinator(graph)
+        self.server = serve(self.coordinator, ("127.0.0.1", 0),
+                            self.AUTHKEY)
+
+    def test_submit(self):
+        """
+        Tests whether the coordinator validates and applies deltas.
+        """
+        proxy = connect(self.server.address, self.AUTHKEY)
+        version, graph = proxy.incumbent()
+        self.assertEqual((0, 32, 5), (version, graph.order, graph.degree))
+        self.assertEqual(self.graph.aspl, graph.aspl)
+
+        edges = sorted((a.id, b.id) for a, b in self.graph.edges())
+        vertex_a_id, vertex_b_id = edges[0]
+
+        # non-existing edge
+        self.assertIsNone(proxy.submit(0, ((vertex_a_id, vertex_a_id),), ()))
+        # vertex out of range
+        self.assertIsNone(proxy.submit(0, (), ((0, 32),)))
+        # not better
+        self.assertIsNone(proxy.submit(0, (edges[0],), (edges[0],)))
+        self.assertIsNone(proxy.submit(0, (edges[0],), ()))
+        self.assertEqual(0, proxy.version())
+
+        # workers' analyses are not trusted
+        self.assertFalse(hasattr(proxy, "submit_trusted"))
+
+    def test_workers(self):
+        """
+        Tests whether workers push improvements to the coordinator.
+        """
+        processes = [
+            Process(target=Worker(RandomlyReplaceTwoEdges(None),
+                                  self.server.address, self.AUTHKEY).run)
+            for _ in range(2)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            version = self.coordinator.wait_for_improvement(0, 60)
+        finally:
+            for process in processes:
+                process.terminate()
+
+        self.assertGreater(version, 0)
+        self.assertTrue(self.coordinator.best_graph < self.graph)
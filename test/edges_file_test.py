@@ -0,0 +1,70 @@
+"""
+Tests reading and writing of edges files.
+"""
+
+from os import remove
+from tempfile import mkstemp
+from gzip import open as gzip_open
+
+from test import BaseTest
+from lib.graph_elements import GolfGraph
+from lib.edges_file import read_edge_ids, write_edges, EdgesFileError
+
+class EdgesFileTest(BaseTest):
+    """
+    See module docstring.
+    """
+
+    def setUp(self):
+        """
+        Creates a file name to work with.
+        """
+        _, self.filename = mkstemp()
+
+    def tearDown(self):
+        """
+        Removes the file again.
+        """
+        remove(self.filename)
+
+    def assert_read_fails(self, content, line_number):
+        """
+        Asserts that reading ``content`` fails at ``line_number``.
+        """
+        with open(self.filename, "w") as open_file:
+            open_file.write(content)
+        with self.assertRaises(EdgesFileError) as context:
+            read_edge_ids(self.filename)
+        self.assertEqual(line_number, context.exception.line_number)
+
+    def test_invalid(self):
+        """
+        Tests whether malformed files are rejected (invalid graphs are
+        up to ``lib.validation``).
+        """
+        self.assert_read_fails("0 1\n0\n", 2)
+        self.assert_read_fails("0 1\nx 2\n", 2)
+        self.assert_read_fails("0 1\n\n1 2 3\n", 3)
+
+    def test_gzip(self):
+        """
+        Tests whether compressed files are read transparently.
+        """
+        graph = GolfGraph(32, 5)
+        graph.add_as_many_random_edges_as_possible()
+
+        compressed_filename = self.filename + ".gz"
+        write_edges(compressed_filename, graph)
+        try:
+            with gzip_open(compressed_filename, "rt") as open_file:
+                self.assertEqual(len(graph.edges()),
+                                 len(open_file.readlines()))
+            read_graph = GolfGraph(32, 5)
+            read_graph.add_edge_ids_unsafe(read_edge_ids(compressed_filename))
+        finally:
+            remove(compressed_filename)
+
+        self.assertEqual(
+            sorted((a.id, b.id) for a, b in graph.edges()),
+            sorted((a.id, b.id) for a, b in read_graph.edges())
+        )
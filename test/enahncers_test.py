@@ -3,10 +3,16 @@ Tests enhancer operations.
 """
 
 from itertools import combinations
+from queue import Queue
 
 from test import BaseTest
 from lib.graph_elements import GolfGraph, Vertex, GraphPartitionedError
-from lib.enhancers import Registry
+from lib.enhancers import (Registry, RandomlyReplaceOneEdge,
+                           RandomlyReplaceTwoEdges,
+                           RandomlyReplaceFourEdgesOfRemoteVertices,
+                           TabuSearch)
+from lib.scoring import neighbours, score
+from lib.distributed import Coordinator
 
 
 
@@ -45,6 +51,139 @@ class GolfGraphTest(BaseTest):
                     modified = enhancer.modify_graph(original.duplicate())
                 except GraphPartitionedError:
                     continue
-                else:
+                # (e.g., ``TabuSearch`` finds no swap to make at times)
+                if modified is not None:
                     break
             self.assert_all_edges_used(modified)
+
+    def test_remove_random_edge_avoids_bridges(self):
+        """
+        Tests that removing edges while avoiding bridges never partitions
+        the graph.
+        """
+        graph = GolfGraph(50, 3)
+        graph.add_as_many_random_edges_as_possible()
+        enhancer = Registry.enhancers[0](None)
+        removed = 0
+        for vertex in graph.vertices * 2:
+            if enhancer.remove_random_edge(
+                    graph, vertex, avoid_bridges=True
+            ) is not None:
+                removed += 1
+            self.assertTrue(graph.connected())
+        self.assertTrue(removed)
+
+    def test_enhance_reports_delta(self):
+        """
+        Tests that enhancers report edge deltas, which turn the incumbent
+        into a graph with the reported analysis.
+        """
+        graph = GolfGraph(32, 3)
+        graph.add_as_many_random_edges_as_possible()
+        graph.analyze()
+        report_queue = Queue()
+        RandomlyReplaceTwoEdges(None).enhance(graph, report_queue, 7)
+
+        enhancer_name, version, removed, added, analysis = report_queue.get()
+        self.assertEqual(enhancer_name, "RandomlyReplaceTwoEdges")
+        self.assertEqual(version, 7)
+
+        coordinator = Coordinator(graph)
+        self.assertEqual(
+            coordinator.submit_trusted(0, removed, added, analysis), 1
+        )
+        enhanced_graph = coordinator.best_graph
+        self.assertTrue(enhanced_graph < graph)
+        self.assertEqual(enhanced_graph.analysis(), analysis)
+
+        # untrusted: rejected w/o analysis, if not better anyway
+        self.assertIsNone(Coordinator(graph).submit(0, removed, added,
+                                                    graph.metrics()))
+
+        # the same delta for the (changed) incumbent is analyzed again
+        self.assertIsNone(coordinator.submit_trusted(0, removed, added,
+                                                     analysis))
+
+        # the hops cache is refilled lazily
+        vertex_a, vertex_b = enhanced_graph.vertices[:2]
+        self.assertEqual(len(enhanced_graph.hops(vertex_a, vertex_b)) + 1,
+                         enhanced_graph.hops_count(vertex_a, vertex_b))
+
+    def test_seen_graphs_skipped(self):
+        """
+        Tests that graphs seen before are not analyzed again.
+        """
+        # the only edge to add to a regular graph is the one removed
+        graph = GolfGraph(32, 3)
+        while len(graph.edges()) < 48:
+            graph = GolfGraph(32, 3)
+            graph.add_as_many_random_edges_as_possible()
+        graph.analyze()
+        enhancer = RandomlyReplaceOneEdge(None)
+        self.assertIsNone(enhancer.attempt(graph))
+        self.assertEqual(enhancer.statistics["seen"], 1)
+
+        enhancer = RandomlyReplaceTwoEdges(None)
+        enhancer.SEEN_CAPACITY = 2
+        graphs = []
+        for _ in range(3):
+            candidate = graph.duplicate()
+            while candidate.fingerprint in [graph.fingerprint] + [
+                    seen_graph.fingerprint for seen_graph in graphs
+            ]:
+                candidate = enhancer.modify_graph(graph.duplicate())
+            graphs.append(candidate)
+            self.assertFalse(enhancer.seen(candidate, graph))
+        self.assertTrue(enhancer.seen(graphs[2], graph))
+        self.assertTrue(enhancer.seen(graphs[1], graph))
+        # forgotten, since least recently seen
+        self.assertFalse(enhancer.seen(graphs[0], graph))
+        # forgotten, since the best graph changed
+        self.assertFalse(enhancer.seen(graphs[2], graphs[1]))
+
+    def test_remote_vertices_preferred(self):
+        """
+        Tests that the vertices at the ends of a line are considered more
+        often than those in the middle.
+        """
+        graph = GolfGraph(4, 2)
+        vertices = graph.vertices
+        for i in range(3):
+            graph.add_edge_unsafe(vertices[i], vertices[i + 1])
+        graph.analyze()
+        self.assertEqual(list(graph.distance_sums), [6, 4, 4, 6])
+
+        enhancer = RandomlyReplaceFourEdgesOfRemoteVertices(None)
+        enhancer.NUMBER_OF_EDGES_TO_REPLACE = 1
+        considered = [enhancer.vertices_to_consider(graph)[0].id
+                      for _ in range(1000)]
+        ends = considered.count(0) + considered.count(3)
+        self.assertGreater(ends, 700)
+
+    def test_tabu_search(self):
+        """
+        Tests that the tabu search keeps its walk consistent and finds a
+        better graph.
+        """
+        graph = GolfGraph(64, 3)
+        graph.add_as_many_random_edges_as_possible()
+        graph.analyze()
+        enhancer = TabuSearch(None)
+
+        enhanced_graph = None
+        for _ in range(100):
+            enhanced_graph = enhancer.attempt(graph)
+            walk = enhancer._walk
+            self.assertEqual(
+                [sorted(ids) for ids in enhancer._neighbours],
+                [sorted(ids) for ids in neighbours(walk)]
+            )
+            self.assertEqual(enhancer._score, score(neighbours(walk)))
+            if enhanced_graph is not None:
+                break
+
+        self.assertIsNotNone(enhanced_graph)
+        self.assertTrue(enhanced_graph < graph)
+        self.assertEqual(sorted(len(v.edges_to) for v in graph.vertices),
+                         sorted(len(v.edges_to)
+                                for v in enhanced_graph.vertices))
@@ -5,6 +5,7 @@ Tests various operations of graph elements.
 from itertools import permutations, combinations
 from copy import deepcopy
 from pickle import loads, dumps
+from unittest.mock import patch
 
 from test import BaseTest
 from lib.graph_elements import GolfGraph, Vertex, GraphPartitionedError
@@ -203,6 +204,43 @@ class GolfGraphTest(BaseTest):
         with self.assertRaises(GraphPartitionedError):
             graph.analyze()
 
+    def test_connected(self):
+        """
+        Checks the connectivity check, also on dirty graphs.
+        """
+        graph = self.rectangle_graph()
+        self.assertTrue(graph.connected())
+        graph.remove_edge_unsafe(graph.vertices[0], graph.vertices[1])
+        self.assertTrue(graph.connected())
+        graph.remove_edge_unsafe(graph.vertices[2], graph.vertices[3])
+        self.assertFalse(graph.connected())
+        self.assertFalse(self.unconnected_graph().connected())
+
+    def test_bridges(self):
+        """
+        Checks the bridges against removing every edge and checking the
+        connectivity, also after modifications.
+        """
+        graph = self.rectangle_graph()
+        vertices = graph.vertices
+        self.assertEqual(graph.bridges(), set())
+        graph.remove_edge_unsafe(vertices[3], vertices[0])
+        self.assertEqual(graph.bridges(), {(0, 1), (1, 2), (2, 3)})
+        self.assertTrue(graph.is_bridge(vertices[2], vertices[1]))
+
+        graph = GolfGraph(30, 3)
+        graph.add_as_many_random_edges_as_possible()
+        for _ in range(10):
+            graph.remove_edge_unsafe(*next(iter(graph.edges())))
+            if not graph.connected():
+                break
+            for vertex_a, vertex_b in list(graph.edges()):
+                graph.remove_edge_unsafe(vertex_a, vertex_b)
+                connected = graph.connected()
+                graph.add_edge_unsafe(vertex_a, vertex_b)
+                self.assertEqual(graph.is_bridge(vertex_a, vertex_b),
+                                 not connected)
+
     def test_analyze_triangle(self):
         """
         Checks analysis results for a 'triangle graph'.
@@ -222,6 +260,30 @@ class GolfGraphTest(BaseTest):
         graph.analyze()
         self.assertEqual(graph.diameter, 2)
         self.assertEqual(graph.aspl, 4/3)
+        self.assertEqual(graph.total_distance, 16)
+        self.assertEqual(graph.distance_counts, [0, 8, 4])
+        self.assertEqual(graph.diameter_pairs, 4)
+        self.assertEqual(graph.mspl, 1)
+        self.assertEqual(list(graph.eccentricities), [2, 2, 2, 2])
+        self.assertEqual(len(graph.peripheral_vertices()), 4)
+
+    def test_analyze_diameter_limit(self):
+        """
+        Checks that the analysis stops early if the diameter exceeds a
+        limit, and completes otherwise.
+        """
+        graph = self.rectangle_graph()
+        vertices = graph.vertices
+        graph.remove_edge_unsafe(vertices[3], vertices[0])
+
+        self.assertFalse(graph.analyze(2, [vertices[0]]))
+        self.assertTrue(graph.dirty)
+        self.assertTrue(graph.analyze(3, [vertices[1]]))
+        self.assertFalse(graph.dirty)
+        self.assertEqual(graph.diameter, 3)
+        self.assertEqual(list(graph.eccentricities), [3, 2, 2, 3])
+        self.assertEqual(graph.peripheral_vertices(),
+                         [vertices[0], vertices[3]])
 
     def test_remove_edge(self):
         """
@@ -244,6 +306,23 @@ class GolfGraphTest(BaseTest):
         self.assertNotIn(vertex1, vertex0.edges_to)
         self.assertIn(vertex2, vertex1.edges_to)
 
+    def test_edges_index(self):
+        """
+        Tests whether the edges index stays consistent with ``edges_to``
+        when removing edges.
+        """
+        graph = GolfGraph(32, 5)
+        graph.add_as_many_random_edges_as_possible()
+        for vertex_a in graph.vertices[:8]:
+            vertex_b = vertex_a.edges_to[0]
+            graph.remove_edge_unsafe(vertex_a, vertex_b)
+            self.assertNotIn(vertex_b, vertex_a.edges_index)
+            self.assertNotIn(vertex_a, vertex_b.edges_index)
+        for vertex in graph.vertices:
+            self.assertEqual(len(vertex.edges_to), len(vertex.edges_index))
+            for position, edge_to in enumerate(vertex.edges_to):
+                self.assertEqual(position, vertex.edges_index[edge_to])
+
     def test_remove_edge_rectangle(self):
         """
         Tests whether removing and edge makes the path longer
@@ -271,9 +350,11 @@ class GolfGraphTest(BaseTest):
         # vertices
         for vertex_a, vertex_b in combinations(graph_a.vertices, 2):
             hops_a = graph_a.hops_cache.get(vertex_a, vertex_b)
-            hops_b = graph_b.hops_cache.get(vertex_a, vertex_b)
+            hops_b = graph_b.hops_cache.get(graph_b.vertices[vertex_a.id],
+                                            graph_b.vertices[vertex_b.id])
             for hop_a, hop_b in zip(hops_a, hops_b):
                 self.assertNotEqual(id(hop_a), id(hop_b))
+                self.assertIs(hop_b, graph_b.vertices[hop_b.id])
 
         # modify graph a
         graph_a.remove_edge_unsafe(vertex_a0, vertex_a1)
@@ -282,6 +363,41 @@ class GolfGraphTest(BaseTest):
         self.assertIn(vertex_b1, vertex_b0.edges_to)
         self.assertIn(vertex_b0, vertex_b1.edges_to)
 
+    def test_fingerprint(self):
+        """
+        Tests that the fingerprint follows the edges.
+        """
+        graph = GolfGraph(16, 3)
+        self.assertEqual(graph.fingerprint, 0)
+        graph.add_as_many_random_edges_as_possible()
+        fingerprint = graph.fingerprint
+        self.assertNotEqual(fingerprint, 0)
+        self.assertEqual(graph.duplicate().fingerprint, fingerprint)
+        self.assertEqual(GolfGraph.from_edge_ids(16, 3, graph.edge_ids())
+                         .fingerprint, fingerprint)
+
+        # removing and adding the same edge yields the same graph
+        vertex_a = graph.vertices[0]
+        vertex_b = vertex_a.edges_to[0]
+        graph.remove_edge_unsafe(vertex_a, vertex_b)
+        self.assertNotEqual(graph.fingerprint, fingerprint)
+        graph.add_edge_unsafe(vertex_b, vertex_a)
+        self.assertEqual(graph.fingerprint, fingerprint)
+
+        # but swapping edges does not
+        vertex_c, vertex_d = next(
+            (vertex_c, vertex_d)
+            for vertex_c, vertex_d in graph.edges()
+            if len({vertex_a, vertex_b, vertex_c, vertex_d}) == 4 and
+            vertex_c not in vertex_a.edges_index and
+            vertex_d not in vertex_b.edges_index
+        )
+        graph.remove_edge_unsafe(vertex_a, vertex_b)
+        graph.remove_edge_unsafe(vertex_c, vertex_d)
+        graph.add_edge_unsafe(vertex_a, vertex_c)
+        graph.add_edge_unsafe(vertex_b, vertex_d)
+        self.assertNotEqual(graph.fingerprint, fingerprint)
+
     def test_edges_rectangle(self):
         """
         Tests whether ``edges()`` does what we expect.
@@ -310,12 +426,14 @@ class GolfGraphTest(BaseTest):
 
     def test_no_duplicate_vertices(self):
         """
-        Tests whether we can have equal but non-identical vertices.
-        We shouldn't, since - in our specific case - it would suggest
-        duplicate vertices in memory and hence, inefficiency.
+        Tests that vertices are equal only if identical, i.e., vertices
+        of the same ID in different graphs are not.
         """
-        with self.assertRaises(AssertionError):
-            Vertex(1) == Vertex(1)
+        vertex = Vertex(1)
+        self.assertEqual(vertex, vertex)
+        self.assertNotEqual(vertex, Vertex(1))
+        self.assertEqual(len({vertex, Vertex(1)}), 2)
+        self.assertFalse(hasattr(vertex, "__dict__"))
 
     def test_pickle_and_unpickle(self):
         """
@@ -325,36 +443,103 @@ class GolfGraphTest(BaseTest):
             graph.analyze()
             unpickled = loads(dumps(graph))
 
+            # hops caches are not pickled
+            for vertex_a, vertex_b in combinations(unpickled.vertices, 2):
+                self.assertIsNone(
+                    unpickled.hops_cache.get(vertex_a, vertex_b)
+                )
+
             # two times: 1st as unpickled, 2nd re-analyzed
             for _ in range(2):
 
-                for attr_name in ("order", "degree", "aspl", "diameter"):
+                for attr_name in ("order", "degree", "aspl", "diameter",
+                                  "mspl"):
                     self.assertEqual(
                         getattr(graph, attr_name),
                         getattr(unpickled, attr_name),
                     )
 
-                for edge_a, edge_b in zip(graph.edges(), unpickled.edges()):
-
-                    # we cannot compare the vertices directly (would raise
-                    # assertions) so we iterate over eeeeverything...
+                # vertices are equal by identity only, so we compare
+                # their IDs
+                self.assertEqual(
+                    sorted((a.id, b.id) for a, b in graph.edges()),
+                    sorted((a.id, b.id) for a, b in unpickled.edges())
+                )
 
-                    # compare edges themselves
+                # compare (lazily refilled) hops
+                for vertex_a, vertex_b in combinations(graph.vertices, 2):
                     self.assertEqual(
-                        tuple(v.id for v in edge_a),
-                        tuple(v.id for v in edge_b)
+                        graph.hops_count(vertex_a, vertex_b),
+                        unpickled.hops_count(
+                            unpickled.vertices[vertex_a.id],
+                            unpickled.vertices[vertex_b.id]
+                        )
                     )
 
-                    # compare hops caches
-                    for vertex_a, vertex_b in combinations(graph.vertices, 2):
-                        hops_a = graph.hops_cache.get(vertex_a, vertex_b)
-                        hops_b = unpickled.hops_cache.get(vertex_a, vertex_b)
-                        for hop_a, hop_b in zip(hops_a, hops_b):
-                            self.assertEqual(hop_a.id, hop_b.id)
+                unpickled._dirty = True
+                unpickled.analyze()
 
-                    self.assertEqual(graph.diameter, unpickled.diameter)
-                    self.assertEqual(graph.aspl, unpickled.aspl)
-                    self.assertEqual(graph.mspl, unpickled.mspl)
+    def test_pickle_distances(self):
+        """
+        Tests pickling graphs along with their distances.
+        """
+        graph = GolfGraph(32, 3)
+        graph.add_as_many_random_edges_as_possible()
+        graph.analyze()
+        with patch.object(GolfGraph, "PICKLE_DISTANCES", True):
+            unpickled = loads(dumps(graph))
+            self.assertTrue(unpickled.hops_cache.complete())
+
+            # incomplete caches are not pickled
+            partial = loads(dumps(graph))
+            partial.hops_cache.clear()
+            partial.hops(partial.vertices[0], partial.vertices[1])
+            self.assertFalse(loads(dumps(partial)).hops_cache.complete())
+
+        for vertex_a, vertex_b in combinations(graph.vertices, 2):
+            unpickled_vertex_a = unpickled.vertices[vertex_a.id]
+            unpickled_vertex_b = unpickled.vertices[vertex_b.id]
+            self.assertEqual(
+                graph.hops_count(vertex_a, vertex_b),
+                unpickled.hops_cache.distance(unpickled_vertex_a,
+                                              unpickled_vertex_b)
+            )
+            # any path is a shortest one, as long as it is connected
+            hops = ((unpickled_vertex_a,) +
+                    unpickled.hops(unpickled_vertex_a, unpickled_vertex_b) +
+                    (unpickled_vertex_b,))
+            self.assertEqual(len(hops) - 1,
+                             graph.hops_count(vertex_a, vertex_b))
+            for hop_a, hop_b in zip(hops, hops[1:]):
+                self.assertIn(hop_b, hop_a.edges_to)
+
+    def test_hops_cache_paths(self):
+        """
+        Tests whether the hops cache returns shortest paths, walking
+        forward as well as backwards.
+        """
+        graph = GolfGraph(32, 3)
+        graph.add_as_many_random_edges_as_possible()
+        graph.analyze()
+        distances = {
+            (vertex_a, vertex_b): graph.hops_count(vertex_a, vertex_b)
+            for vertex_a, vertex_b in permutations(graph.vertices, 2)
+        }
+
+        # only the distances from one vertex cached
+        source = graph.vertices[0]
+        graph.hops_cache.clear()
+        graph.hops_count(source, graph.vertices[1])
+
+        for vertex in graph.vertices[1:]:
+            for vertex_a, vertex_b in ((source, vertex), (vertex, source)):
+                hops = graph.hops_cache.get(vertex_a, vertex_b)
+                self.assertIsNotNone(hops)
+                path = (vertex_a,) + hops + (vertex_b,)
+                self.assertEqual(distances[vertex_a, vertex_b],
+                                 len(path) - 1)
+                for hop_a, hop_b in zip(path, path[1:]):
+                    self.assertIn(hop_b, hop_a.edges_to)
 
     def test_hops_cache_reverse_lookup(self):
         """
@@ -0,0 +1,70 @@
+"""
+Tests the island model.
+"""
+
+from queue import Queue
+
+from test import BaseTest
+from lib.graph_elements import GolfGraph
+from lib.enhancers import RandomlyReplaceOneEdge
+from lib.islands import Island, neighbours, pack, unpack
+
+class IslandsTest(BaseTest):
+    """
+    See module docstring.
+    """
+
+    def test_neighbours(self):
+        """
+        Tests the supported topologies.
+        """
+        self.assertEqual((1,), neighbours(0, 3, "ring"))
+        self.assertEqual((0,), neighbours(2, 3, "ring"))
+        self.assertEqual((0, 2), neighbours(1, 3, "all-to-all"))
+        self.assertEqual((), neighbours(0, 1, "ring"))
+        with self.assertRaises(ValueError):
+            neighbours(0, 3, "star")
+
+    def test_pack_and_unpack(self):
+        """
+        Tests whether graphs survive migration.
+        """
+        graph = GolfGraph(32, 5)
+        graph.add_as_many_random_edges_as_possible()
+        graph.analyze()
+        migrant = unpack(pack(graph))
+        self.assertEqual(
+            sorted((a.id, b.id) for a, b in graph.edges()),
+            sorted((a.id, b.id) for a, b in migrant.edges()),
+        )
+        self.assertEqual(graph.aspl, migrant.aspl)
+        self.assertEqual(graph.diameter, migrant.diameter)
+
+    def test_immigrate(self):
+        """
+        Tests whether islands accept better migrants only.
+        """
+        worse = GolfGraph(4, 2)
+        vertices = worse.vertices
+        worse.add_edge_unsafe(vertices[0], vertices[1])
+        worse.add_edge_unsafe(vertices[1], vertices[2])
+        worse.add_edge_unsafe(vertices[2], vertices[3])
+        worse.analyze()
+        better = worse.duplicate()
+        better.add_edge_unsafe(better.vertices[3], better.vertices[0])
+        better.analyze()
+
+        inboxes = [Queue(), Queue()]
+        island = Island(0, RandomlyReplaceOneEdge(None), inboxes, Queue(),
+                        1, "ring")
+
+        island.incumbent = better
+        inboxes[0].put(pack(worse))
+        island.immigrate()
+        self.assertIs(better, island.incumbent)
+
+        island.incumbent = worse
+        inboxes[0].put(pack(better))
+        island.immigrate()
+        self.assertEqual(better.aspl, island.incumbent.aspl)
+        self.assertTrue(inboxes[0].empty())
@@ -0,0 +1,131 @@
+"""
+Tests the implementations of the kernels against straightforward
+breadth-first searches, i.e., that all implementations yield identical
+results.
+"""
+
+from array import array
+from collections import deque
+from unittest import skipUnless
+
+from test import BaseTest
+from lib import kernels
+from lib.graph_elements import GolfGraph
+from lib.scoring import neighbours
+
+def distances_from(neighbour_ids, source_id):
+    """
+    Returns a list of the distances from ``source_id`` (-1 if
+    unreachable) in the graph given as lists of neighbours' IDs.
+    """
+    distances = [-1] * len(neighbour_ids)
+    distances[source_id] = 0
+    queue = deque([source_id])
+    while queue:
+        vertex_id = queue.popleft()
+        for neighbour_id in neighbour_ids[vertex_id]:
+            if distances[neighbour_id] < 0:
+                distances[neighbour_id] = distances[vertex_id] + 1
+                queue.append(neighbour_id)
+    return distances
+
+
+class AbstractKernelsTest(object):
+    """
+    Tests of the kernels of ``IMPLEMENTATION``, shared by all of them.
+    """
+
+    IMPLEMENTATION = None
+
+    def setUp(self):
+        """
+        Loads the implementation and creates some graphs, given as lists
+        of the neighbours' IDs.
+        """
+        self.kernels = kernels.load(self.IMPLEMENTATION)
+        self.graphs = [
+            [[1], [0]],
+            # path and partitioned graphs
+            [[1], [0, 2], [1, 3], [2]],
+            [[1], [0], [3], [2], []],
+        ]
+        for order, degree in ((5, 4), (32, 3), (33, 5), (100, 3)):
+            graph = GolfGraph(order, degree)
+            graph.add_as_many_random_edges_as_possible()
+            self.graphs.append(neighbours(graph))
+
+    def test_breadth_first_search(self):
+        """
+        Tests the distances, counts and sums.
+        """
+        for neighbour_ids in self.graphs:
+            order = len(neighbour_ids)
+            adjacency = self.kernels.adjacency(neighbour_ids)
+            for typecode in ("h", "l"):
+                counts = array("q", [0]) * order
+                expected_counts = [0] * order
+                for source_id in range(order):
+                    expected_distances = distances_from(neighbour_ids,
+                                                        source_id)
+                    distances = array(typecode, [-1]) * order
+                    self.assertEqual(
+                        self.kernels.breadth_first_search(
+                            adjacency, source_id, distances, counts
+                        ),
+                        (order - expected_distances.count(-1),
+                         max(expected_distances),
+                         sum(distance for distance in expected_distances
+                             if distance > 0))
+                    )
+                    self.assertEqual(distances.tolist(), expected_distances)
+                    for distance in expected_distances:
+                        if distance > 0:
+                            expected_counts[distance] += 1
+
+                    # w/o counts
+                    distances = array(typecode, [-1]) * order
+                    self.kernels.breadth_first_search(adjacency, source_id,
+                                                      distances)
+                    self.assertEqual(distances.tolist(), expected_distances)
+                self.assertEqual(counts.tolist(), expected_counts)
+
+    def test_score(self):
+        """
+        Tests the scores, with and w/o bounds.
+        """
+        for neighbour_ids in self.graphs:
+            adjacency = self.kernels.adjacency(neighbour_ids)
+            distances = [distances_from(neighbour_ids, source_id)
+                         for source_id in range(len(neighbour_ids))]
+            if any(-1 in row for row in distances):
+                self.assertIsNone(self.kernels.score(adjacency))
+                continue
+
+            diameter = max(max(row) for row in distances)
+            total_distance = sum(sum(row) for row in distances)
+            for bound, expected_score in (
+                    (None, (diameter, total_distance)),
+                    ((diameter, total_distance), (diameter, total_distance)),
+                    ((diameter + 1, 0), (diameter, total_distance)),
+                    ((diameter, total_distance - 1), None),
+                    ((diameter - 1, 10 ** 9), None),
+            ):
+                self.assertEqual(self.kernels.score(adjacency, bound),
+                                 expected_score)
+
+
+class PurePythonKernelsTest(AbstractKernelsTest, BaseTest):
+    """
+    See ``AbstractKernelsTest``.
+    """
+
+    IMPLEMENTATION = "pure_python"
+
+
+@skipUnless("numba_jit" in kernels.available(), "Numba not installed")
+class NumbaKernelsTest(AbstractKernelsTest, BaseTest):
+    """
+    See ``AbstractKernelsTest``.
+    """
+
+    IMPLEMENTATION = "numba_jit"
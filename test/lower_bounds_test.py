@@ -0,0 +1,51 @@
+"""
+Tests the calculation of lower bounds.
+"""
+
+from test import BaseTest
+from lib.lower_bounds import lower_bounds, table, aspl, gaps
+
+class LowerBoundsTest(BaseTest):
+    """
+    See module docstring.
+    """
+
+    def test_moore_graphs(self):
+        """
+        Tests the lower bounds for graphs which are known to reach them.
+        """
+        # Petersen graph: 3 neighbours, 6 vertices at distance 2
+        self.assertEqual((2, 10 * (3 + 6 * 2)), lower_bounds(10, 3))
+        # cycle
+        self.assertEqual((2, 4 * (1 + 1 + 2)), lower_bounds(4, 2))
+        # complete graph
+        self.assertEqual((1, 5 * 4), lower_bounds(5, 4))
+        self.assertEqual((1, 5 * 4), lower_bounds(5, 10))
+
+    def test_challenge_values(self):
+        """
+        Tests the lower bounds against values published by the challenge
+        (see the file names of our ideal graphs).
+        """
+        diameter, total_distance = lower_bounds(32, 5)
+        self.assertEqual(3, diameter)
+        self.assertEqual("2.032258", "%f" % aspl(total_distance, 32))
+
+    def test_edge_cases(self):
+        """
+        Tests orders and degrees less than two.
+        """
+        self.assertEqual((0, 0), lower_bounds(1, 0))
+        self.assertEqual((1, 2), lower_bounds(2, 1))
+        self.assertEqual((None, None), lower_bounds(3, 1))
+        self.assertEqual((None, None), lower_bounds(2, 0))
+        self.assertEqual((None, None), gaps(3, 1, 2, 6))
+
+    def test_table_and_gaps(self):
+        """
+        Tests precomputed tables and gaps.
+        """
+        bounds = table((10, 32), (3, 5))
+        self.assertEqual(4, len(bounds))
+        self.assertEqual(lower_bounds(32, 5), bounds[(32, 5)])
+        self.assertEqual((1, 2), gaps(10, 3, 3, 152))
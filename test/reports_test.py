@@ -0,0 +1,58 @@
+"""
+Tests the reporting from processes through pipes.
+"""
+
+from multiprocessing import Process
+
+from test import BaseTest
+from lib.reports import ReportPipes
+
+
+def report(report_writer, *reports):
+    """
+    Puts ``reports`` and ends (to be run in a process).
+    """
+    for report_ in reports:
+        report_writer.put(report_)
+
+
+class ReportPipesTest(BaseTest):
+    """
+    See module docstring.
+    """
+
+    def test_get_and_drain(self):
+        """
+        Tests receiving reports of many processes, until they ended.
+        """
+        reports = ReportPipes()
+        processes = [
+            Process(target=report, args=(reports.writer(), (i, 0), (i, 1)))
+            for i in range(3)
+        ]
+        for process in processes:
+            process.start()
+        reports.started()
+        for process in processes:
+            process.join()
+
+        received = [reports.get(10)] + reports.drain()
+        self.assertEqual(sorted(received),
+                         [(i, j) for i in range(3) for j in range(2)])
+
+        # all processes ended, nothing left to wait for
+        self.assertEqual(reports.drain(), [])
+        self.assertIsNone(reports.get())
+        reports.close()
+
+    def test_same_process(self):
+        """
+        Tests reporting from within the receiving process.
+        """
+        reports = ReportPipes()
+        report_writer = reports.writer()
+        self.assertEqual(reports.drain(), [])
+        self.assertIsNone(reports.get(0))
+        report(report_writer, "a", "b")
+        self.assertEqual(reports.drain(), ["a", "b"])
+        reports.close()
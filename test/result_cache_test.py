@@ -0,0 +1,80 @@
+"""
+Tests the on-disk cache of the analysis of edges files.
+"""
+
+from os import listdir
+from os.path import join
+from tempfile import TemporaryDirectory
+
+from test import BaseTest
+from lib.graph_elements import GolfGraph
+from lib.edges_file import write_edges
+from lib.result_cache import ResultCache
+
+class ResultCacheTest(BaseTest):
+    """
+    See module docstring.
+    """
+
+    def setUp(self):
+        """
+        Initializes a cache in a temporary directory and an analyzed
+        graph written to an edges file.
+        """
+        self.directory = TemporaryDirectory()
+        self.cache = ResultCache(join(self.directory.name, "cache"))
+        self.graph = GolfGraph(32, 3)
+        self.graph.add_as_many_random_edges_as_possible()
+        self.graph.analyze()
+        self.filename = join(self.directory.name, "edges")
+        write_edges(self.filename, self.graph)
+
+    def tearDown(self):
+        """
+        Removes the temporary directory.
+        """
+        self.directory.cleanup()
+
+    def test_put_and_get(self):
+        """
+        Tests that analyzed graphs are cached by their edges file.
+        """
+        self.assertIsNone(self.cache.get(self.filename, 32, 3))
+        self.cache.put(self.filename, self.graph)
+
+        cached_graph = self.cache.get(self.filename, 32, 3)
+        self.assertFalse(cached_graph.dirty)
+        self.assertEqual(cached_graph.metrics(), self.graph.metrics())
+        self.assertEqual(cached_graph.edge_ids(), self.graph.edge_ids())
+        self.assertEqual(cached_graph.distance_counts,
+                         self.graph.distance_counts)
+
+        # the key is the content (and order and degree), not the name
+        self.assertIsNone(self.cache.get(self.filename, 32, 4))
+        with open(self.filename, "a") as open_file:
+            open_file.write("\n")
+        self.assertIsNone(self.cache.get(self.filename, 32, 3))
+
+    def test_broken_entry(self):
+        """
+        Tests that broken entries are ignored.
+        """
+        self.cache.put(self.filename, self.graph)
+        with open(self.cache.path(self.filename, 32, 3), "wb") as open_file:
+            open_file.write(b"broken")
+        with self.assertLogs(level="WARNING"):
+            self.assertIsNone(self.cache.get(self.filename, 32, 3))
+
+    def test_prune(self):
+        """
+        Tests that only the most recent entries are kept.
+        """
+        self.cache.MAX_ENTRIES = 2
+        for order in (30, 31, 32):
+            graph = GolfGraph(order, 3)
+            graph.add_as_many_random_edges_as_possible()
+            graph.analyze()
+            write_edges(self.filename, graph)
+            self.cache.put(self.filename, graph)
+        self.assertEqual(len(listdir(self.cache.directory)), 2)
+        self.assertIsNotNone(self.cache.get(self.filename, 32, 3))
@@ -0,0 +1,69 @@
+"""
+Tests the adaptive scheduling of enhancers.
+"""
+
+from test import BaseTest
+from lib.scheduling import EnhancerScheduler
+
+class EnhancerA(object):
+    """ Dummy enhancer class. """
+
+class EnhancerB(object):
+    """ Dummy enhancer class. """
+
+class EnhancerC(object):
+    """ Dummy enhancer class. """
+
+class EnhancerSchedulerTest(BaseTest):
+    """
+    See module docstring.
+    """
+
+    def test_unexplored_first(self):
+        """
+        Tests whether every enhancer class gets a slot initially.
+        """
+        scheduler = EnhancerScheduler((EnhancerA, EnhancerB, EnhancerC), 4)
+        assigned = scheduler.assign()
+        self.assertEqual(4, len(assigned))
+        self.assertEqual({EnhancerA, EnhancerB, EnhancerC}, set(assigned))
+
+    def test_fewer_slots_than_classes(self):
+        """
+        Tests whether we do not assign more slots than available.
+        """
+        scheduler = EnhancerScheduler((EnhancerA, EnhancerB, EnhancerC), 2)
+        self.assertEqual([EnhancerA, EnhancerB], scheduler.assign())
+
+    def test_successful_gets_more_slots(self):
+        """
+        Tests whether successful enhancers get more slots over time and
+        whether the scheduler adapts when success shifts.
+        """
+        classes = (EnhancerA, EnhancerB, EnhancerC)
+        scheduler = EnhancerScheduler(classes, 9)
+
+        for _ in range(20):
+            slots = scheduler.assign()
+            scheduler.record(slots, 1.0, [EnhancerA])
+        slots = scheduler.assign()
+        self.assertGreater(slots.count(EnhancerA), slots.count(EnhancerB))
+        self.assertGreater(slots.count(EnhancerA), slots.count(EnhancerC))
+        self.assertIn(EnhancerB, slots)
+
+        for _ in range(40):
+            slots = scheduler.assign()
+            scheduler.record(slots, 1.0, [EnhancerC])
+        slots = scheduler.assign()
+        self.assertGreater(slots.count(EnhancerC), slots.count(EnhancerA))
+
+    def test_drop(self):
+        """
+        Tests whether dropped enhancer classes do not get slots anymore.
+        """
+        scheduler = EnhancerScheduler((EnhancerA, EnhancerB, EnhancerC), 4)
+        scheduler.drop(EnhancerB)
+        self.assertEqual({EnhancerA, EnhancerC}, set(scheduler.assign()))
+        scheduler.drop(EnhancerA)
+        scheduler.drop(EnhancerC)
+        self.assertEqual([], scheduler.assign())
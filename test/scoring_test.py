@@ -0,0 +1,89 @@
+"""
+Tests the bit-parallel scoring of graphs.
+"""
+
+from random import choice
+
+from test import BaseTest
+from lib.graph_elements import GolfGraph
+from lib.scoring import neighbours, score, score_swaps, swap, unswap
+
+class ScoringTest(BaseTest):
+    """
+    See module docstring.
+    """
+
+    def test_score(self):
+        """
+        Tests the scores against the analysis of some random graphs.
+        """
+        for order, degree in ((2, 2), (5, 4), (32, 3), (33, 5), (100, 3)):
+            graph = GolfGraph(order, degree)
+            graph.add_as_many_random_edges_as_possible()
+            graph.analyze()
+            self.assertEqual(score(neighbours(graph)),
+                             (graph.diameter, graph.total_distance))
+
+    def test_bound(self):
+        """
+        Tests that graphs worse than the bound are not scored.
+        """
+        graph = GolfGraph(32, 3)
+        graph.add_as_many_random_edges_as_possible()
+        graph_neighbours = neighbours(graph)
+        diameter, total_distance = score(graph_neighbours)
+
+        self.assertEqual(score(graph_neighbours, (diameter, total_distance)),
+                         (diameter, total_distance))
+        self.assertEqual(score(graph_neighbours, (diameter + 1, 0)),
+                         (diameter, total_distance))
+        self.assertIsNone(score(graph_neighbours,
+                                (diameter, total_distance - 1)))
+        self.assertIsNone(score(graph_neighbours, (diameter - 1, 10 ** 9)))
+
+    def test_partitioned(self):
+        """
+        Tests that partitioned graphs are not scored.
+        """
+        self.assertIsNone(score([[1], [0], [3], [2]]))
+        self.assertIsNone(score([[], []]))
+
+    def test_score_swaps(self):
+        """
+        Tests the scores of swaps against the scores of the swapped
+        graphs.
+        """
+        graph = GolfGraph(64, 3)
+        graph.add_as_many_random_edges_as_possible()
+        graph_neighbours = neighbours(graph)
+        swaps = []
+        while len(swaps) < 32:
+            a_id = choice(range(64))
+            c_id = choice(range(64))
+            b_id = choice(graph_neighbours[a_id])
+            d_id = choice(graph_neighbours[c_id])
+            if (len({a_id, b_id, c_id, d_id}) == 4 and
+                    c_id not in graph_neighbours[a_id] and
+                    d_id not in graph_neighbours[b_id]):
+                swaps.append((a_id, b_id, c_id, d_id))
+
+        for bound in (None, score(graph_neighbours)):
+            expected_scores = []
+            expected_bound = bound
+            for candidate_swap in swaps:
+                swap(graph_neighbours, candidate_swap)
+                swap_score = score(graph_neighbours, expected_bound)
+                unswap(graph_neighbours, candidate_swap)
+                expected_scores.append(swap_score)
+                if swap_score is not None and (expected_bound is None or
+                                               swap_score < expected_bound):
+                    expected_bound = swap_score
+            self.assertEqual(score_swaps(graph_neighbours, swaps, bound),
+                             expected_scores)
+        self.assertEqual([sorted(ids) for ids in graph_neighbours],
+                         [sorted(ids) for ids in neighbours(graph)])
+
+        # the cycle 0-1-2-3-4-5 falls apart into 0-4-5 and 1-2-3
+        self.assertEqual(score_swaps([[1, 5], [0, 2], [1, 3], [2, 4],
+                                      [3, 5], [4, 0]], [(0, 1, 4, 3)]),
+                         [None])
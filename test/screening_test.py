@@ -0,0 +1,56 @@
+"""
+Tests the statistical screening of candidate graphs.
+"""
+
+from test import BaseTest
+from lib.graph_elements import GolfGraph
+from lib.screening import Screening
+
+class ScreeningTest(BaseTest):
+    """
+    See module docstring.
+    """
+
+    @staticmethod
+    def random_graph():
+        """
+        Returns an analyzed random graph.
+        """
+        graph = GolfGraph(64, 3)
+        graph.add_as_many_random_edges_as_possible()
+        graph.analyze()
+        return graph
+
+    @staticmethod
+    def ring_graph(order):
+        """
+        Returns a (dirty) graph of ``order`` with the vertices connected
+        as a ring.
+        """
+        graph = GolfGraph(order, 3)
+        vertices = graph.vertices
+        for i in range(order):
+            graph.add_edge_unsafe(vertices[i], vertices[(i + 1) % order])
+        return graph
+
+    def test_exact(self):
+        """
+        Tests that the estimate is exact when sampling all vertices.
+        """
+        incumbent = self.random_graph()
+        screening = Screening(incumbent.order, 0.01)
+        self.assertEqual(screening.estimate(incumbent.duplicate(), incumbent),
+                         (incumbent.total_distance, 0, incumbent.diameter))
+        self.assertFalse(screening.rejects(incumbent.duplicate(), incumbent))
+
+    def test_rejects(self):
+        """
+        Tests that a clearly worse graph is rejected with few sources.
+        """
+        incumbent = self.random_graph()
+        candidate = self.ring_graph(incumbent.order)
+        screening = Screening(4, 0.01)
+        estimate, _, max_distance = screening.estimate(candidate, incumbent)
+        self.assertGreater(estimate, incumbent.total_distance)
+        self.assertEqual(max_distance, incumbent.order // 2)
+        self.assertTrue(screening.rejects(candidate, incumbent))
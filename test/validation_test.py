@@ -0,0 +1,48 @@
+"""
+Tests the validation of edges.
+"""
+
+from test import BaseTest
+from lib.graph_elements import GolfGraph
+from lib.validation import validate
+
+class ValidationTest(BaseTest):
+    """
+    See module docstring.
+    """
+
+    def test_valid(self):
+        """
+        Tests whether a valid graph passes.
+        """
+        graph = GolfGraph(32, 5)
+        graph.add_as_many_random_edges_as_possible()
+        report = validate(32, 5, graph.edge_ids())
+        self.assertTrue(report.ok)
+        self.assertEqual(0, report.unreachable)
+        self.assertEqual(32, sum(report.degree_histogram))
+        self.assertIn("ok", str(report))
+
+    def test_invalid(self):
+        """
+        Tests whether all problems are found.
+        """
+        edge_ids = (
+            0, 1,
+            1, 0,   # duplicate
+            2, 2,   # self-loop
+            0, 9,   # out of range
+            0, 2,
+            0, 3,   # degree of 0 exceeded
+            4, 5,   # partitioned
+        )
+        report = validate(6, 2, edge_ids)
+        self.assertFalse(report.ok)
+        self.assertEqual(
+            {"duplicate edge": 1, "self-loop": 1, "vertex out of range": 1,
+             "degree exceeded": 1, "partitioned": 1},
+            report.counts
+        )
+        self.assertEqual(2, report.unreachable)
+        self.assertEqual([0, 4, 1, 0, 1], report.degree_histogram)
+        self.assertIn("invalid", str(report))